@@ -1,13 +1,11 @@
 import datetime
 
 from firebase_admin import firestore
-from google.cloud import bigquery
 
 from ..bqloader import get_schema_columns
 from ..cryptotick import CryptoTick, CryptoTickDailyMixin, CryptoTickHourlyMixin
-from ..fscache import FirestoreCache
-from ..utils import get_delta
-from .lib import get_timestamp_from_to
+from ..fscache import clear_firestore_caches, flush_firestore, get_firestore_cache
+from ..utils import get_delta, get_fingerprint
 
 
 class BaseAggregator(CryptoTick):
@@ -20,6 +18,8 @@ class BaseAggregator(CryptoTick):
         period_to=None,
         require_cache=False,
         has_multiple_symbols=False,
+        batch_size=1,
+        force=False,
         verbose=False,
     ):
         self.source_table = source_table
@@ -27,6 +27,8 @@ class BaseAggregator(CryptoTick):
         self.symbol = symbol
         self.require_cache = require_cache
         self.has_multiple_symbols = has_multiple_symbols
+        self.batch_size = batch_size
+        self.force = force
         self.period_from = self.get_period_from(period_from)
         self.period_to = self.get_period_to(period_to)
         self.verbose = verbose
@@ -55,12 +57,12 @@ class BaseAggregator(CryptoTick):
     @property
     def firestore_source(self):
         collection = self.get_source(sep="-")
-        return FirestoreCache(collection)
+        return get_firestore_cache(collection)
 
     @property
     def firestore_destination(self):
         collection = self.get_destination(sep="-")
-        return FirestoreCache(collection)
+        return get_firestore_cache(collection)
 
     def get_period(self, timestamp):
         raise NotImplementedError
@@ -118,87 +120,101 @@ class BaseAggregator(CryptoTick):
 
     def main(self):
         if self.period_from and self.period_to:
+            clear_firestore_caches()
+            self.preload("firestore_source")
+            self.preload("firestore_destination")
+            partitions = []
             for partition in self.iter_partition():
-                self.partition_decorator = self.get_partition_decorator(partition)
                 document = self.get_document_name(partition)
                 if self.firestore_source.has_data(document):
-                    if not self.firestore_destination.has_data(document):
-                        data_frame = self.get_data_frame()
-                        # Are there any trades?
-                        if len(data_frame):
-                            df = self.process_data_frame(data_frame)
-                            self.write(df)
-                        # No trades
-                        else:
-                            self.set_firebase(
-                                {}, attr="firestore_destination", is_complete=True
-                            )
+                    if self.force or not self.firestore_destination.has_data(document):
+                        partitions.append(partition)
                     elif self.verbose:
                         print(f"{self.log_prefix}: {document} OK")
                 else:
                     print(f"{self.log_prefix}: {document} No data")
+            try:
+                for batch in self.get_batches(partitions):
+                    if len(batch) == 1:
+                        self.set_partition(batch[0])
+                        self.process_partition(self.get_data_frame())
+                    else:
+                        self.process_batch(batch)
+            finally:
+                flush_firestore()
         else:
             print(f"{self.log_prefix}: No data")
 
-    def get_data_frame(self):
-        raise NotImplementedError
+    def get_batches(self, partitions):
+        """Consecutive partitions, so each batch is read at once."""
+        batches = []
+        for partition in partitions:
+            if batches and len(batches[-1]) < self.batch_size:
+                # Partitions are reversed.
+                timestamp_from, _ = self.get_timestamp_from_to(batches[-1][-1])
+                _, timestamp_to = self.get_timestamp_from_to(partition)
+                if timestamp_to == timestamp_from:
+                    batches[-1].append(partition)
+                    continue
+            batches.append([partition])
+        return batches
+
+    def process_batch(self, partitions):
+        timestamp_from, _ = self.get_timestamp_from_to(partitions[-1])
+        _, timestamp_to = self.get_timestamp_from_to(partitions[0])
+        data_frame = self.read_data_frame(timestamp_from, timestamp_to)
+        for partition in partitions:
+            self.set_partition(partition)
+            start, stop = self.get_timestamp_from_to(partition)
+            timestamp = data_frame["timestamp"]
+            df = data_frame[(timestamp >= start) & (timestamp < stop)]
+            self.process_partition(df.reset_index(drop=True))
+
+    def process_partition(self, data_frame):
+        # Are there any trades?
+        if len(data_frame):
+            df = self.process_data_frame(data_frame)
+            self.write(df)
+        # No trades
+        else:
+            self.set_firebase({}, attr="firestore_destination", is_complete=True)
+        # Partition boundary
+        flush_firestore()
 
-    @property
-    def job_config(self):
-        raise NotImplementedError
+    def get_data_frame(self):
+        timestamp_from, timestamp_to = self.get_timestamp_from_to(self.partition)
+        return self.read_data_frame(timestamp_from, timestamp_to)
 
-    @property
-    def where_clause(self):
+    def read_data_frame(self, timestamp_from, timestamp_to):
         raise NotImplementedError
 
     def aggregate(self, data_frame, cache):
         raise NotImplementedError
 
     def write(self, data_frame):
+        # Skip load, if a re-run has identical data.
+        fingerprint = get_fingerprint(data_frame)
+        if self.is_unchanged(fingerprint, attr="firestore_destination"):
+            return
         # BigQuery
         bigquery_loader = self.get_bigquery_loader(
             self.destination_table, self.partition_decorator
         )
         bigquery_loader.write_table(self.schema, data_frame)
         # Firebase
-        self.set_firebase(data_frame, attr="firestore_destination", is_complete=True)
+        self.set_firebase(
+            data_frame,
+            attr="firestore_destination",
+            is_complete=True,
+            fingerprint=fingerprint,
+        )
 
 
 class HourlyAggregatorMixin(CryptoTickHourlyMixin):
     def get_period(self, timestamp):
         return timestamp.replace(tzinfo=datetime.timezone.utc)
 
-    @property
-    def job_config(self):
-        timestamp_from, timestamp_to = get_timestamp_from_to(self.partition)
-        return bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter(
-                    "timestamp_from", "TIMESTAMP", timestamp_from
-                ),
-                bigquery.ScalarQueryParameter(
-                    "timestamp_to", "TIMESTAMP", timestamp_to
-                ),
-            ]
-        )
-
-    @property
-    def where_clause(self):
-        return "timestamp >= @timestamp_from and timestamp < @timestamp_to"
-
 
 class DailyAggregatorMixin(CryptoTickDailyMixin):
     def get_period(self, timestamp):
         return timestamp.date()
-
-    @property
-    def job_config(self):
-        return bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "DATE", self.partition)
-            ]
-        )
-
-    @property
-    def where_clause(self):
-        return "date(timestamp) = @date"
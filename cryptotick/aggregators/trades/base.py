@@ -1,4 +1,8 @@
-from ...bqloader import MULTIPLE_SYMBOL_AGGREGATE_SCHEMA, SINGLE_SYMBOL_AGGREGATE_SCHEMA
+from ...bqloader import (
+    MULTIPLE_SYMBOL_AGGREGATE_SCHEMA,
+    SINGLE_SYMBOL_AGGREGATE_SCHEMA,
+    get_row_restriction,
+)
 from ..base import BaseAggregator
 from .lib import aggregate_trades
 
@@ -15,24 +19,22 @@ class BaseTradeAggregator(BaseAggregator):
         else:
             return SINGLE_SYMBOL_AGGREGATE_SCHEMA
 
-    def get_data_frame(self):
-        # Query by partition.
+    def read_data_frame(self, timestamp_from, timestamp_to):
+        # Read partitions with the Storage Read API, streams are unordered.
+        columns = ["timestamp", "nanoseconds", "price", "volume", "notional"]
+        columns += ["tickRule", "index"]
+        sort_by = ["timestamp", "nanoseconds", "index"]
         if self.has_multiple_symbols:
-            fields = "timestamp, nanoseconds, symbol, price, volume, notional, tickRule"
-            order_by = "symbol, timestamp, nanoseconds, index"
-        else:
-            fields = "timestamp, nanoseconds, price, volume, notional, tickRule"
-            order_by = "timestamp, nanoseconds, index"
-        sql = f"""
-            SELECT {fields}
-            FROM {self.source_table}
-            WHERE {self.where_clause}
-            ORDER BY {order_by};
-        """
+            columns.insert(2, "symbol")
+            sort_by.insert(0, "symbol")
         bigquery_loader = self.get_bigquery_loader(
             self.source_table, self.partition_decorator
         )
-        return bigquery_loader.read_table(sql, self.job_config)
+        table = bigquery_loader.read_arrow(
+            columns, row_restriction=get_row_restriction(timestamp_from, timestamp_to)
+        )
+        data_frame = table.to_pandas().sort_values(sort_by, ignore_index=True)
+        return data_frame.drop(columns=["index"])
 
     def process_data_frame(self, data_frame):
         df = aggregate_trades(
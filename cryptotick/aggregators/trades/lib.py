@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -17,7 +18,7 @@ def is_sample(last_row, row, has_multiple_symbols=False):
     )
 
 
-def aggregate_trades(data_frame, has_multiple_symbols=False):
+def aggregate_trades_by_row(data_frame, has_multiple_symbols=False):
     idx = 0
     samples = []
     total_rows = len(data_frame) - 1
@@ -67,6 +68,75 @@ def aggregate_trades(data_frame, has_multiple_symbols=False):
     return data_frame
 
 
+def aggregate_trades(data_frame, has_multiple_symbols=False):
+    # Are there any trades?
+    if not len(data_frame):
+        return pd.DataFrame([])
+    data_frame = data_frame.reset_index(drop=True)
+    starts = get_sample_starts(data_frame, has_multiple_symbols)
+    stops = np.append(starts[1:], len(data_frame)) - 1
+    lengths = stops - starts + 1
+    prices = data_frame.price.to_numpy()
+    volumes = data_frame.volume.to_numpy()
+    notionals = data_frame.notional.to_numpy()
+    first_prices = prices[starts]
+    # Samples equal to aggregate_trade, sums are ordered equally.
+    notional = segment_sum(notionals, starts, lengths)
+    vwap = segment_sum(volumes, starts, lengths, is_cumulative=True) / segment_sum(
+        notionals, starts, lengths, is_cumulative=True
+    )
+    expected = first_prices * notional
+    actual = vwap * notional
+    is_equal_price = prices == np.repeat(first_prices, lengths)
+    has_slippage = ~np.logical_and.reduceat(is_equal_price, starts)
+    slippage = np.where(has_slippage, np.abs(expected - actual), 0.0)
+    last_rows = data_frame.iloc[stops].reset_index(drop=True)
+    data = {
+        "date": last_rows.timestamp.dt.date,
+        "timestamp": last_rows.timestamp,
+        "nanoseconds": last_rows.nanoseconds,
+        "price": last_rows.price,
+        "slippage": slippage,
+        "volume": segment_sum(volumes, starts, lengths),
+        "notional": notional,
+        "ticks": lengths,
+        "tickRule": last_rows.tickRule,
+    }
+    if has_multiple_symbols:
+        data.update({"symbol": last_rows.symbol})
+    data_frame = pd.DataFrame(data)
+    # Round slippage
+    data_frame.slippage = data_frame.slippage.round(6)
+    return data_frame
+
+
+def get_sample_starts(data_frame, has_multiple_symbols=False):
+    columns = ["timestamp", "nanoseconds", "tickRule"]
+    if has_multiple_symbols:
+        columns.insert(0, "symbol")
+    is_sample = np.zeros(len(data_frame), dtype=bool)
+    is_sample[0] = True
+    for column in columns:
+        values = data_frame[column].values
+        is_sample[1:] |= values[1:] != values[:-1]
+    return np.flatnonzero(is_sample)
+
+
+def segment_sum(values, starts, lengths, is_cumulative=False):
+    # Segments of equal length are summed as rows of a matrix, so that
+    # each sum is bit-identical to Series.sum or Series.cumsum of the segment.
+    result = np.empty(len(starts), dtype="float64")
+    for length in np.unique(lengths):
+        is_length = lengths == length
+        index = starts[is_length][:, np.newaxis] + np.arange(length)
+        matrix = values[index]
+        if is_cumulative:
+            result[is_length] = np.cumsum(matrix, axis=1)[:, -1]
+        else:
+            result[is_length] = matrix.sum(axis=1)
+    return result
+
+
 def aggregate_trade(data_frame, has_multiple_symbols=False):
     last_row = data_frame.iloc[-1]
     timestamp = last_row.timestamp
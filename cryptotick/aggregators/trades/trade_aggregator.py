@@ -7,6 +7,8 @@ def trade_aggregator(
     period_from: str = None,
     period_to: str = None,
     has_multiple_symbols: bool = False,
+    batch_size: int = 1,
+    force: bool = False,
     verbose: bool = False,
 ):
     assert source_table
@@ -19,6 +21,8 @@ def trade_aggregator(
             period_from=timestamp_from,
             period_to=timestamp_to,
             has_multiple_symbols=has_multiple_symbols,
+            batch_size=batch_size,
+            force=force,
             verbose=verbose,
         ).main()
     if date_from and date_to:
@@ -27,5 +31,7 @@ def trade_aggregator(
             period_from=date_from,
             period_to=date_to,
             has_multiple_symbols=has_multiple_symbols,
+            batch_size=batch_size,
+            force=force,
             verbose=verbose,
         ).main()
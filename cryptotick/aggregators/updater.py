@@ -1,8 +1,6 @@
-from google.cloud import bigquery
-
-from ..bqloader import BigQueryDaily
+from ..bqloader import BigQueryDaily, get_row_restriction
 from ..cryptotick import CryptoTick, CryptoTickDailyMixin
-from ..fscache import FirestoreCache
+from ..fscache import clear_firestore_caches, flush_firestore, get_firestore_cache
 from ..utils import parse_period_from_to
 
 
@@ -50,30 +48,31 @@ class Updater(CryptoTickDailyMixin, CryptoTick):
     @property
     def firestore_cache(self):
         collection = self.get_source(sep="-")
-        return FirestoreCache(collection)
+        return get_firestore_cache(collection)
 
     def main(self):
-        for partition in self.iter_partition():
-            data = self.get_document(partition)
-            if data and "candles" in data:
-                data_frame = self.get_data_frame()
-                self.set_firebase(data_frame, is_complete=data["ok"])
+        clear_firestore_caches()
+        self.preload()
+        try:
+            for partition in self.iter_partition():
+                data = self.get_document(partition)
+                if data and "candles" in data:
+                    data_frame = self.get_data_frame()
+                    self.set_firebase(data_frame, is_complete=data["ok"])
+                # Partition boundary
+                flush_firestore()
+        finally:
+            flush_firestore()
         print(f"{self.log_prefix}: Maybe complete")
 
     def get_data_frame(self):
-        # Query by partition.
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("date", "DATE", self.partition)
-            ]
-        )
-        sql = f"""
-          SELECT timestamp, nanoseconds, price, volume, notional, tickRule, index
-          FROM {self.source_table}
-          WHERE date(timestamp) = @date
-          ORDER BY timestamp, nanoseconds, index;
-        """
+        # Read partition with the Storage Read API, streams are unordered.
+        columns = ["timestamp", "nanoseconds", "price", "volume", "notional"]
+        columns += ["tickRule", "index"]
+        timestamp_from, timestamp_to = self.get_timestamp_from_to(self.partition)
         partition_decorator = self.get_partition_decorator(self.partition)
-        return BigQueryDaily(self.source_table, partition_decorator).read_table(
-            sql, job_config
+        table = BigQueryDaily(self.source_table, partition_decorator).read_arrow(
+            columns, row_restriction=get_row_restriction(timestamp_from, timestamp_to)
         )
+        sort_by = ["timestamp", "nanoseconds", "index"]
+        return table.to_pandas().sort_values(sort_by, ignore_index=True)
@@ -1,5 +1,13 @@
 from .bqloader import BigQueryDaily, BigQueryHourly
-from .lib import get_schema_columns, get_table_id, stringify_datetime_types
+from .constants import MAX_BATCH_BYTES, MAX_BATCH_ROWS
+from .lib import (
+    get_bigquery_client,
+    get_row_restriction,
+    get_schema_columns,
+    get_table_id,
+    stringify_datetime_types,
+    uncache_tables,
+)
 from .schema import (
     MULTIPLE_SYMBOL_AGGREGATE_SCHEMA,
     MULTIPLE_SYMBOL_BAR_SCHEMA,
@@ -16,10 +24,15 @@ __all__ = [
     "MULTIPLE_SYMBOL_AGGREGATE_SCHEMA",
     "SINGLE_SYMBOL_BAR_SCHEMA",
     "MULTIPLE_SYMBOL_BAR_SCHEMA",
+    "MAX_BATCH_ROWS",
+    "MAX_BATCH_BYTES",
     "row_to_json",
+    "get_bigquery_client",
+    "get_row_restriction",
     "get_schema_columns",
     "get_table_id",
     "stringify_datetime_types",
+    "uncache_tables",
     "BigQueryDaily",
     "BigQueryHourly",
 ]
@@ -1,24 +1,35 @@
+import datetime
 import os
 import time
+import uuid
 
-import google.auth
 import pandas as pd
+import pyarrow as pa
 from google.auth.exceptions import TransportError
 from google.cloud import bigquery
 
 from ..constants import BIGQUERY_LOCATION, PROJECT_ID
-from .lib import get_schema_columns
+from .constants import MAX_READ_STREAMS
+from .lib import (
+    cache_table,
+    get_bigquery_client,
+    get_schema_columns,
+    get_table_schema,
+    get_tables,
+    uncache_table,
+)
+from .storage import (
+    create_read_session,
+    get_arrow_schema,
+    get_bigquery_storage_client,
+    iter_record_batches,
+)
 
 
 class BaseBigQueryLoader:
     def __init__(self, table_id, partition_decorator):
-        credentials, _ = google.auth.default(
-            scopes=["https://www.googleapis.com/auth/cloud-platform"]
-        )
-        self.bq = bigquery.Client(
-            credentials=credentials,
-            project=os.environ[PROJECT_ID],
-            location=os.environ.get(BIGQUERY_LOCATION, None),
+        self.bq = get_bigquery_client(
+            os.environ[PROJECT_ID], location=os.environ.get(BIGQUERY_LOCATION, None)
         )
 
         dataset, table_name = table_id.split(".")
@@ -32,45 +43,51 @@ class BaseBigQueryLoader:
     def partition(self):
         return f"{self.table_id}${self.partition_decorator}"
 
+    @property
+    def table_path(self):
+        project = self.bq.project
+        return f"projects/{project}/datasets/{self.dataset}/tables/{self.table_name}"
+
     def table_exists(self):
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("table", "STRING", self.table_name)
-            ]
-        )
-        query = f"""
-            SELECT size_bytes FROM {self.dataset}.__TABLES__
-            WHERE table_id = @table;
-        """
-        job = self.bq.query(query, job_config=job_config)
-        rows = job.result()
-        return len(list(rows)) > 0
+        # Cached, so no query job per write.
+        return self.table_name in get_tables(self.bq, self.dataset)
+
+    def get_schema(self):
+        return get_table_schema(self.bq, self.dataset, self.table_name)
 
     def create_table(self, schema):
         table_id = f"{self.bq.project}.{self.dataset}.{self.table_name}"
         table = bigquery.Table(table_id, schema=schema)
         # Partition on date.
         table = self.set_partition(table)
-        self.bq.create_table(table)
+        self.bq.create_table(table, exists_ok=True)
+        cache_table(self.bq, self.dataset, self.table_name, schema)
 
     def set_partition(self, table):
         raise NotImplementedError
 
-    def read_table(self, sql, job_config, retry=5):
-        # Retry n times
-        r = retry - 1
-        try:
-            return self.read(sql, job_config)
-        except TransportError as exception:
-            if r == 0:
-                raise exception
-            else:
-                time.sleep(5)
-                self.read_table(sql, job_config, retry=r)
+    def get_timestamp_from_to(self, partition_decorator):
+        raise NotImplementedError
 
-    def read(self, sql, job_config):
-        query = self.bq.query(sql, job_config=job_config)
-        return query.result().to_dataframe()
+    def get_read_session(self, columns, row_restriction=None, max_streams=None):
+        return create_read_session(
+            get_bigquery_storage_client(),
+            self.bq.project,
+            self.table_path,
+            columns,
+            row_restriction=row_restriction,
+            max_streams=max_streams or MAX_READ_STREAMS,
+        )
+
+    def iter_record_batches(self, columns, row_restriction=None, max_streams=None):
+        """Storage Read API, so record batches may be processed while reading."""
+        session = self.get_read_session(columns, row_restriction, max_streams)
+        return iter_record_batches(get_bigquery_storage_client(), session)
+
+    def read_arrow(self, columns, row_restriction=None, max_streams=None):
+        session = self.get_read_session(columns, row_restriction, max_streams)
+        batches = iter_record_batches(get_bigquery_storage_client(), session)
+        return pa.Table.from_batches(batches, schema=get_arrow_schema(session))
 
     def write_table(self, schema, data, retry=5):
         # Retry n times
@@ -104,6 +121,92 @@ class BaseBigQueryLoader:
                 data, self.partition, job_config=job_config
             ).result()
 
+    def write_partitions(self, schema, data_frames, retry=5):
+        # Retry n times, as the transaction replaces partitions.
+        r = retry - 1
+        try:
+            self.replace_partitions(schema, data_frames)
+        except TransportError as exception:
+            if r == 0:
+                raise exception
+            else:
+                time.sleep(5)
+                self.write_partitions(schema, data_frames, retry=r)
+
+    def replace_partitions(self, schema, data_frames):
+        """Data frames by partition decorator, with one load job.
+
+        Loaded to a staging table, then partitions are replaced in one
+        transaction, so each is truncated as with write.
+        """
+        if not self.table_exists():
+            self.create_table(schema)
+        columns = get_schema_columns(schema)
+        data_frame = pd.concat(
+            [df[columns] for df in data_frames.values()], ignore_index=True
+        )
+        staging_table = self.create_staging_table(schema)
+        try:
+            job_config = bigquery.LoadJobConfig(
+                schema=schema, write_disposition="WRITE_TRUNCATE"
+            )
+            self.bq.load_table_from_dataframe(
+                data_frame, staging_table, job_config=job_config
+            ).result()
+            sql, job_config = self.get_replace_partitions_query(
+                staging_table, columns, list(data_frames)
+            )
+            self.bq.query(sql, job_config=job_config).result()
+        finally:
+            self.bq.delete_table(staging_table, not_found_ok=True)
+
+    def create_staging_table(self, schema):
+        table_name = f"{self.table_name}_staging_{uuid.uuid4().hex}"
+        table = bigquery.Table(
+            f"{self.bq.project}.{self.dataset}.{table_name}", schema=schema
+        )
+        # Expires, if not deleted.
+        table.expires = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(days=1)
+        return self.bq.create_table(table)
+
+    def get_replace_partitions_query(self, staging_table, columns, partitions):
+        table_id = f"{self.bq.project}.{self.dataset}.{self.table_name}"
+        staging_table_id = (
+            f"{staging_table.project}.{staging_table.dataset_id}."
+            f"{staging_table.table_id}"
+        )
+        where_clauses = []
+        query_parameters = []
+        for index, partition_decorator in enumerate(partitions):
+            timestamp_from, timestamp_to = self.get_timestamp_from_to(
+                partition_decorator
+            )
+            where_clauses.append(
+                f"(timestamp >= @timestamp_from_{index} "
+                f"AND timestamp < @timestamp_to_{index})"
+            )
+            query_parameters += [
+                bigquery.ScalarQueryParameter(
+                    f"timestamp_from_{index}", "TIMESTAMP", timestamp_from
+                ),
+                bigquery.ScalarQueryParameter(
+                    f"timestamp_to_{index}", "TIMESTAMP", timestamp_to
+                ),
+            ]
+        names = ", ".join([f"`{column}`" for column in columns])
+        sql = f"""
+            BEGIN TRANSACTION;
+            DELETE FROM `{table_id}` WHERE {" OR ".join(where_clauses)};
+            INSERT INTO `{table_id}` ({names})
+            SELECT {names} FROM `{staging_table_id}`;
+            COMMIT TRANSACTION;
+        """
+        job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+        return sql, job_config
+
     def delete_table(self):
         if self.table_exists():
             self.bq.delete_table(self.table_id)
+            uncache_table(self.bq, self.dataset, self.table_name)
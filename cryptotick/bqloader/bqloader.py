@@ -1,3 +1,5 @@
+import datetime
+
 import pandas as pd
 from google.cloud import bigquery
 
@@ -13,6 +15,12 @@ class BigQueryHourly(BaseBigQueryLoader):
         )
         return table
 
+    def get_timestamp_from_to(self, partition_decorator):
+        timestamp_from = datetime.datetime.strptime(
+            partition_decorator, "%Y%m%d%H"
+        ).replace(tzinfo=datetime.timezone.utc)
+        return timestamp_from, timestamp_from + datetime.timedelta(hours=1)
+
 
 class BigQueryDaily(BaseBigQueryLoader):
     def set_partition(self, table):
@@ -21,3 +29,9 @@ class BigQueryDaily(BaseBigQueryLoader):
             type_=bigquery.TimePartitioningType.DAY,
         )
         return table
+
+    def get_timestamp_from_to(self, partition_decorator):
+        timestamp_from = datetime.datetime.strptime(
+            partition_decorator, "%Y%m%d"
+        ).replace(tzinfo=datetime.timezone.utc)
+        return timestamp_from, timestamp_from + datetime.timedelta(days=1)
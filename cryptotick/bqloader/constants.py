@@ -0,0 +1,3 @@
+MAX_READ_STREAMS = 8  # Storage Read API, streams read in parallel
+MAX_BATCH_ROWS = 5_000_000  # Load job, partitions in one batch
+MAX_BATCH_BYTES = 512 * 1024 * 1024
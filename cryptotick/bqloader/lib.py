@@ -1,8 +1,30 @@
 import os
+import threading
+
+import google.auth
+from google.cloud import bigquery
 
 from ..constants import BIGQUERY_DATASET, BIGQUERY_TABLES
 from ..utils import set_env_list
 
+BIGQUERY_CLIENTS = {}
+BIGQUERY_TABLES_CACHE = {}  # Schemas by table name, by project and dataset
+LOCK = threading.Lock()
+
+
+def get_bigquery_client(project, location=None):
+    """Clients are shared by project and location, and are thread safe."""
+    with LOCK:
+        key = (project, location)
+        if key not in BIGQUERY_CLIENTS:
+            credentials, _ = google.auth.default(
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+            BIGQUERY_CLIENTS[key] = bigquery.Client(
+                credentials=credentials, project=project, location=location
+            )
+        return BIGQUERY_CLIENTS[key]
+
 
 def get_table_id(exchange, suffix=""):
     if "PYTEST_CURRENT_TEST" in os.environ:
@@ -14,6 +36,55 @@ def get_table_id(exchange, suffix=""):
     return table_id
 
 
+def get_tables(bq, dataset):
+    """Tables of dataset, with one list_tables call per process."""
+    with LOCK:
+        key = (bq.project, dataset)
+        if key not in BIGQUERY_TABLES_CACHE:
+            BIGQUERY_TABLES_CACHE[key] = {
+                table.table_id: None for table in bq.list_tables(dataset)
+            }
+        return BIGQUERY_TABLES_CACHE[key]
+
+
+def get_table_schema(bq, dataset, table_name):
+    """Schema of table, with one get_table call per process."""
+    tables = get_tables(bq, dataset)
+    if table_name in tables:
+        if tables[table_name] is None:
+            table = bq.get_table(f"{bq.project}.{dataset}.{table_name}")
+            cache_table(bq, dataset, table_name, table.schema)
+        return tables[table_name]
+
+
+def cache_table(bq, dataset, table_name, schema=None):
+    tables = get_tables(bq, dataset)
+    with LOCK:
+        tables[table_name] = schema
+
+
+def uncache_table(bq, dataset, table_name):
+    tables = get_tables(bq, dataset)
+    with LOCK:
+        tables.pop(table_name, None)
+
+
+def uncache_tables(project=None, dataset=None):
+    """Tables created or deleted by others, so list tables again."""
+    with LOCK:
+        for key in list(BIGQUERY_TABLES_CACHE):
+            if project in (None, key[0]) and dataset in (None, key[1]):
+                del BIGQUERY_TABLES_CACHE[key]
+
+
+def get_row_restriction(timestamp_from, timestamp_to):
+    """Storage Read API filter, by timestamp."""
+    return (
+        f'timestamp >= CAST("{timestamp_from.isoformat()}" AS TIMESTAMP) AND '
+        f'timestamp < CAST("{timestamp_to.isoformat()}" AS TIMESTAMP)'
+    )
+
+
 def get_schema_columns(schema):
     return [field.name for field in schema]
 
@@ -0,0 +1,84 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import google.auth
+import pyarrow as pa
+from google.cloud.bigquery_storage import BigQueryReadClient, types
+
+BIGQUERY_STORAGE_CLIENTS = []
+LOCK = threading.Lock()
+
+
+def get_bigquery_storage_client():
+    with LOCK:
+        if not BIGQUERY_STORAGE_CLIENTS:
+            credentials, _ = google.auth.default(
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+            BIGQUERY_STORAGE_CLIENTS.append(BigQueryReadClient(credentials=credentials))
+        return BIGQUERY_STORAGE_CLIENTS[0]
+
+
+def create_read_session(
+    client, project, table, columns, row_restriction=None, max_streams=1
+):
+    read_options = types.ReadSession.TableReadOptions(
+        selected_fields=columns, row_restriction=row_restriction
+    )
+    read_session = types.ReadSession(
+        table=table, data_format=types.DataFormat.ARROW, read_options=read_options
+    )
+    return client.create_read_session(
+        parent=f"projects/{project}",
+        read_session=read_session,
+        max_stream_count=max_streams,
+    )
+
+
+def get_arrow_schema(session):
+    buffer = pa.py_buffer(session.arrow_schema.serialized_schema)
+    return pa.ipc.read_schema(buffer)
+
+
+def read_stream(client, stream, schema, batches, stop):
+    for response in client.read_rows(stream.name):
+        buffer = pa.py_buffer(response.arrow_record_batch.serialized_record_batch)
+        batch = pa.ipc.read_record_batch(buffer, schema)
+        # Put, unless stopped.
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=1)
+            except queue.Full:
+                pass
+            else:
+                break
+        if stop.is_set():
+            return
+
+
+def iter_record_batches(client, session):
+    """Streams are read in parallel, and batches are yielded as they arrive."""
+    schema = get_arrow_schema(session)
+    streams = session.streams
+    if streams:
+        batches = queue.Queue(maxsize=len(streams) * 2)
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(streams)) as executor:
+            futures = [
+                executor.submit(read_stream, client, stream, schema, batches, stop)
+                for stream in streams
+            ]
+            try:
+                while True:
+                    try:
+                        yield batches.get(timeout=1)
+                    except queue.Empty:
+                        if all(future.done() for future in futures):
+                            if batches.empty():
+                                break
+                # Maybe error
+                for future in futures:
+                    future.result()
+            finally:
+                stop.set()
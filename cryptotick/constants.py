@@ -7,6 +7,9 @@ FIRESTORE_COLLECTIONS = "FIRESTORE_COLLECTIONS"
 BIGQUERY_LOCATION = "BIGQUERY_LOCATION"
 BIGQUERY_DATASET = "BIGQUERY_DATASET"
 BIGQUERY_TABLES = "BIGQUERY_TABLES"
+S3_CACHE_DIRECTORY = "S3_CACHE_DIRECTORY"
+S3_CACHE_MAX_SIZE = "S3_CACHE_MAX_SIZE"
+HTTP2 = "HTTP2"
 
 BIGQUERY_HOT = pd.Timedelta("2d")
 
@@ -1,20 +1,40 @@
-import time
+import asyncio
+import datetime
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
 from operator import eq, le
 
-import httpx
+import numpy as np
 import pandas as pd
 import pendulum
-from google.api_core.exceptions import ServiceUnavailable
 
 from .bqloader import (
+    MAX_BATCH_BYTES,
+    MAX_BATCH_ROWS,
+    MULTIPLE_SYMBOL_AGGREGATE_SCHEMA,
+    SINGLE_SYMBOL_AGGREGATE_SCHEMA,
     SINGLE_SYMBOL_SCHEMA,
     BigQueryDaily,
     BigQueryHourly,
     get_schema_columns,
     get_table_id,
 )
-from .fscache import FirestoreCache, firestore_data, get_collection_name
+from .fscache import (
+    clear_firestore_caches,
+    firestore_data,
+    flush_firestore,
+    get_collection_name,
+    get_firestore_cache,
+)
+from .httpclient import get_async_client, run_async
+from .ratelimiter import async_rate_limited_get, get_rate_limiter, rate_limited_get
 from .s3downloader import (
+    COLUMN_TYPES,
     HistoricalDownloader,
     calculate_tick_rule,
     row_to_json,
@@ -23,7 +43,43 @@ from .s3downloader import (
     strip_nanoseconds,
     utc_timestamp,
 )
-from .utils import parse_period_from_to
+from .tradebuffer import TradeBuffer, parse_timestamps
+from .utils import get_fingerprint, parse_period_from_to
+
+
+def init_worker():
+    # Each process initializes Firebase, and has its own clients.
+    os.environ.pop("FIREBASE_INIT", None)
+
+
+def run_partition(crypto_tick, partition):
+    crypto_tick.set_partition(partition)
+    ok = crypto_tick.process_partition(partition)
+    # Written, before the partition is reported.
+    crypto_tick.flush_batch()
+    flush_firestore()
+    return ok
+
+
+def run_stage(stage, args, errors, stop, failed):
+    try:
+        stage(*args)
+    except Exception as exception:
+        errors.append(exception)
+        stop.set()
+        failed.set()
+
+
+def put_queue(q, item, failed, timeout=1):
+    """Put, unless the consumer failed."""
+    while not failed.is_set():
+        try:
+            q.put(item, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            return True
+    return False
 
 
 class CryptoTick:
@@ -34,13 +90,26 @@ class CryptoTick:
         period_from=None,
         period_to=None,
         aggregate=False,
+        workers=1,
+        prefetch=0,
+        batch=False,
+        force=False,
         verbose=False,
     ):
+        # Workers load each partition, so there is nothing to batch.
+        assert not (batch and workers > 1), "batch requires one worker"
         self.exchange = exchange
         self.symbol = symbol
         self.period_from = period_from
         self.period_to = period_to
         self.aggregate = aggregate
+        self.workers = workers
+        self.prefetch = prefetch
+        self.batch = batch
+        self.batch_data_frames = []
+        self.batch_rows = 0
+        self.batch_bytes = 0
+        self.force = force
         self.verbose = verbose
 
     @property
@@ -65,7 +134,12 @@ class CryptoTick:
     def firestore_cache(self):
         suffix = self.get_suffix(sep="-")
         collection = get_collection_name(self.exchange, suffix=suffix)
-        return FirestoreCache(collection)
+        return get_firestore_cache(collection)
+
+    @property
+    def firestore_aggregated(self):
+        collection = f"{self.firestore_cache.collection}-aggregated"
+        return get_firestore_cache(collection)
 
     def get_document_name(self, partition):
         raise NotImplementedError
@@ -81,9 +155,14 @@ class CryptoTick:
         document = self.get_last_document_name(partition)
         return self.firestore_cache.get(document)
 
+    def preload(self, attr="firestore_cache"):
+        """Get documents of all partitions in bulk, rather than one by one."""
+        documents = [self.get_document_name(p) for p in self.iter_partition()]
+        return getattr(self, attr).get_all(documents)
+
     def has_data(self, partition):
         document = self.get_document_name(partition)
-        if self.firestore_cache.has_data(document):
+        if not self.force and self.firestore_cache.has_data(document):
             if self.verbose:
                 print(f"{self.log_prefix}: {document} OK")
             return True
@@ -115,24 +194,57 @@ class CryptoTick:
             }
         return {}
 
-    def set_firebase(self, data, attr="firestore_cache", is_complete=False, retry=5):
+    def is_unchanged(self, fingerprint, attr="firestore_cache"):
+        """Was partition written, with identical data?"""
+        document = self.get_document_name(self.partition)
+        data = getattr(self, attr).get(document)
+        if data and data.get("ok", False):
+            if data.get("fingerprint") == fingerprint:
+                print(f"{self.log_prefix}: {document} Unchanged")
+                return True
+
+    def set_firebase(
+        self, data, attr="firestore_cache", is_complete=False, fingerprint=None
+    ):
         document = self.get_document_name(self.partition)
         # If dict, assume correct
         if isinstance(data, pd.DataFrame):
             data = self.get_firebase_data(data)
         data["ok"] = is_complete
-        # Retry n times
-        r = retry - 1
-        try:
-            getattr(self, attr).set(document, data)
-        except ServiceUnavailable as exception:
-            if r == 0:
-                raise exception
-            else:
-                time.sleep(1)
-                self.set_firebase(data, attr=attr, is_complete=is_complete, retry=r)
+        if fingerprint:
+            data["fingerprint"] = fingerprint
+        # Written in batches, flushed at partition or run boundaries.
+        # Logged once committed.
+        message = f"{self.log_prefix}: {document} OK"
+        getattr(self, attr).set_async(document, data, on_commit=lambda: print(message))
+
+    def get_aggregated(self, data_frame):
+        """Aggregate trades in memory, rather than reading them from BigQuery."""
+        # Circular import
+        from .aggregators.trades.lib import aggregate_trades
+
+        sort_by = ["timestamp", "nanoseconds", "index"]
+        has_multiple_symbols = "symbol" in data_frame.columns
+        if has_multiple_symbols:
+            schema = MULTIPLE_SYMBOL_AGGREGATE_SCHEMA
+            sort_by.insert(0, "symbol")
         else:
-            print(f"{self.log_prefix}: {document} OK")
+            schema = SINGLE_SYMBOL_AGGREGATE_SCHEMA
+        df = aggregate_trades(
+            data_frame.sort_values(sort_by), has_multiple_symbols=has_multiple_symbols
+        )
+        df["index"] = df.index
+        return schema, df[get_schema_columns(schema)]
+
+    def write_aggregated(self, table_id, data_frame, is_complete=True):
+        schema, df = self.get_aggregated(data_frame)
+        # BigQuery
+        bigquery_loader = self.get_bigquery_loader(
+            f"{table_id}_aggregated", self.partition_decorator
+        )
+        bigquery_loader.write_table(schema, df)
+        # Firebase
+        self.set_firebase(df, attr="firestore_aggregated", is_complete=is_complete)
 
     def get_bigquery_loader(self, table_id, partition_value):
         raise NotImplementedError
@@ -149,16 +261,23 @@ class CryptoTickREST(CryptoTick):
         super().__init__(*args, **kwargs)
         self.pagination_id = None
         self.maybe_complete = False
-        self.trades = []
+        self.trades = self.get_trade_buffer()
 
     @property
     def url(self):
+        return self.get_url(self.pagination_id)
+
+    def get_url(self, pagination_id):
         raise NotImplementedError
 
     @property
     def max_requests_per_second(self):
         raise NotImplementedError
 
+    @property
+    def rate_limiter(self):
+        return get_rate_limiter(self.exchange, self.max_requests_per_second)
+
     @property
     def can_paginate(self):
         return True
@@ -184,29 +303,50 @@ class CryptoTickREST(CryptoTick):
             return ok
 
     def main(self):
-        for partition in self.iter_partition():
-            self.trades = self.get_valid_trades(self.trades, operator=le)
-            if not self.has_data(partition):
-                if self.maybe_trades(partition) and self.can_paginate:
-                    stop_execution = False
-                    while not stop_execution:
-                        start_time = time.time()
-                        for i in range(self.max_requests_per_second):
-                            stop_execution = self.get_data()
-                            if stop_execution:
-                                break
-                        if not stop_execution:
-                            elapsed = time.time() - start_time
-                            if elapsed < 1:
-                                diff = 1 - elapsed
-                                time.sleep(diff)
-                elif len(self.trades) and self.can_paginate:
-                    self.update()
-                # Maybe iteration complete
-                elif self.maybe_complete and self.verbose:
-                    print(f"{self.log_prefix}: Maybe complete")
+        clear_firestore_caches()
+        self.preload()
+        try:
+            for partition in self.iter_partition():
+                self.trades = self.get_valid_trades(self.trades, operator=le)
+                if not self.has_data(partition):
+                    if self.maybe_trades(partition) and self.can_paginate:
+                        run_async(self.paginate())
+                    elif len(self.trades) and self.can_paginate:
+                        self.update()
+                    # Maybe iteration complete
+                    elif self.maybe_complete and self.verbose:
+                        print(f"{self.log_prefix}: Maybe complete")
+                        break
+        finally:
+            flush_firestore()
+
+    async def paginate(self):
+        client = get_async_client(self.url)
+        stop_execution = False
+        while not stop_execution:
+            pagination_ids = self.get_next_pagination_ids(self.max_requests_per_second)
+            # Responses are ordered as requested.
+            responses = await asyncio.gather(
+                *[
+                    self.get_async_response(client, self.get_url(pagination_id))
+                    for pagination_id in pagination_ids
+                ]
+            )
+            for pagination_id, response in zip(pagination_ids, responses):
+                # Was the next pagination_id expected?
+                if pagination_id != self.pagination_id:
+                    break
+                stop_execution = self.parse_data_response(response)
+                if stop_execution:
                     break
 
+    def get_next_pagination_ids(self, n):
+        """Next pagination ids, requested concurrently."""
+        return [self.pagination_id]
+
+    async def get_async_response(self, client, url, retry=5):
+        return await async_rate_limited_get(self.rate_limiter, client, url, retry=retry)
+
     def maybe_trades(self, partition):
         # Do trades exceed partition boundaries?
         if len(self.trades):
@@ -214,18 +354,23 @@ class CryptoTickREST(CryptoTick):
             return self.get_partition(last_timestamp) >= partition
         return True
 
+    def get_trade_buffer(self, data=None):
+        trade_buffer = TradeBuffer(get_schema_columns(self.schema))
+        if data is not None:
+            trade_buffer.extend_columns(data)
+        return trade_buffer
+
     def get_valid_trades(self, trades, operator=eq):
-        return [
-            trade
-            for trade in trades
-            if operator(
-                self.get_partition_decorator(trade["timestamp"]),
-                self.partition_decorator,
-            )
-        ]
+        timestamp_from, timestamp_to = self.get_timestamp_from_to(self.partition)
+        start = trades.bisect(timestamp_to)
+        stop = trades.bisect(timestamp_from) if operator is eq else len(trades)
+        return trades[start:stop]
 
     def get_data(self):
         response = self.get_response()
+        return self.parse_data_response(response)
+
+    def parse_data_response(self, response):
         if response:
             if response.status_code == 200:
                 return self.parse_response(response)
@@ -235,53 +380,41 @@ class CryptoTickREST(CryptoTick):
             raise Exception(f"{self.log_prefix}: No response")
 
     def get_response(self, retry=5):
-        e = None
-        # Retry n times.
-        for i in range(retry):
-            try:
-                return httpx.get(self.url)
-            except Exception as exception:
-                e = exception
-                time.sleep(i + 1)
-        raise e
+        return rate_limited_get(self.rate_limiter, self.url, retry=retry)
 
     def parse_response(self, response):
         raise NotImplementedError
 
+    @property
+    def column_mapping(self):
+        """Schema column, to key of trade."""
+        raise NotImplementedError
+
     def parse_data(self, data):
-        return [
+        """Page of trades, to typed columns."""
+        columns = {
+            column: [trade[key] for trade in data]
+            for column, key in self.column_mapping.items()
+        }
+        price = np.array(columns["price"], dtype=np.float64)
+        notional = np.array(columns["notional"], dtype=np.float64)
+        return self.get_trade_buffer(
             {
-                "uid": self.get_uid(trade),
-                "timestamp": self.get_timestamp(trade),
-                "nanoseconds": self.get_nanoseconds(trade),
-                "price": self.get_price(trade),
-                "volume": self.get_volume(trade),
-                "notional": self.get_notional(trade),
-                "tickRule": self.get_tick_rule(trade),
-                "index": self.get_index(trade),
+                "uid": [str(uid) for uid in columns["uid"]],
+                "timestamp": parse_timestamps(columns["timestamp"]),
+                "nanoseconds": np.zeros(len(data), dtype=np.int64),
+                "price": price,
+                "volume": self.get_volume(price, notional),
+                "notional": notional,
+                "tickRule": self.get_tick_rule(np.array(columns["tickRule"])),
+                "index": np.array(columns["index"], dtype=np.int64),
             }
-            for trade in data
-        ]
-
-    def get_uid(self, trade):
-        raise NotImplementedError
-
-    def get_timestamp(self, trade):
-        raise NotImplementedError
-
-    def get_price(self, trade):
-        raise NotImplementedError
-
-    def get_volume(self, trade):
-        raise NotImplementedError
+        )
 
-    def get_notional(self, trade):
+    def get_volume(self, price, notional):
         raise NotImplementedError
 
-    def get_tick_rule(self, trade):
-        raise NotImplementedError
-
-    def get_index(self, trade):
+    def get_tick_rule(self, side):
         raise NotImplementedError
 
     def update_trades(self, trades):
@@ -291,7 +424,7 @@ class CryptoTickREST(CryptoTick):
                 self.partition_decorator
                 != self.get_partition_decorator(start["timestamp"])
             )
-            self.trades += trades
+            self.trades.extend(trades)
             # Verbose
             if self.verbose:
                 timestamp = start["timestamp"].replace(tzinfo=None).isoformat()
@@ -314,23 +447,26 @@ class CryptoTickREST(CryptoTick):
         else:
             data = self.get_document(self.partition)
             self.set_firebase({}, is_complete=True)
+            if self.aggregate:
+                self.set_firebase({}, attr="firestore_aggregated", is_complete=True)
+        # Partition boundary, as pagination may write several partitions.
+        flush_firestore()
 
-    def write(self, trades):
+    def write(self, trades, is_complete=None):
         start = trades[-1]
         stop = trades[0]
         assert self.get_partition_decorator(
             start["timestamp"]
         ) == self.get_partition_decorator(stop["timestamp"])
         # Dataframe
-        columns = get_schema_columns(self.schema)
-        data_frame = pd.DataFrame(trades, columns=columns)
-        data_frame = set_types(data_frame)
+        data_frame = set_types(trades.to_data_frame())
         self.assert_data_frame(data_frame, trades)
-        data = self.get_last_document(self.partition)
-        is_complete = data is not None
-        # Assert last trade
-        if is_complete:
-            self.assert_is_complete(trades)
+        if is_complete is None:
+            data = self.get_last_document(self.partition)
+            is_complete = data is not None
+            # Assert last trade
+            if is_complete:
+                self.assert_is_complete(trades)
         # BigQuery
         suffix = self.get_suffix(sep="_")
         table_id = get_table_id(self.exchange, suffix=suffix)
@@ -339,6 +475,9 @@ class CryptoTickREST(CryptoTick):
         # Firebase
         data_frame = data_frame.iloc[::-1]  # Reverse data frame
         self.set_firebase(data_frame, is_complete=is_complete)
+        # Aggregated, without reading back from BigQuery
+        if self.aggregate:
+            self.write_aggregated(table_id, data_frame, is_complete=is_complete)
 
     def assert_data_frame(self, data_frame, trades):
         # Are trades unique?
@@ -369,16 +508,23 @@ class CryptoTickHourlyMixin:
     def get_partition_decorator(self, timestamp):
         return timestamp.strftime("%Y%m%d%H")  # Partition by hour
 
+    def get_timestamp_from_to(self, timestamp):
+        timestamp_from = timestamp.replace(minute=0, second=0, microsecond=0)
+        return timestamp_from, timestamp_from + datetime.timedelta(hours=1)
+
     def get_bigquery_loader(self, table_id, partition_decorator):
         return BigQueryHourly(table_id, partition_decorator)
 
     def iter_partition(self):
         period = pendulum.period(self.period_to, self.period_from)  # Reverse order
         for partition in period.range("hours"):
-            self.partition = partition
-            self.partition_decorator = self.get_partition_decorator(partition)
+            self.set_partition(partition)
             yield partition
 
+    def set_partition(self, partition):
+        self.partition = partition
+        self.partition_decorator = self.get_partition_decorator(partition)
+
 
 class CryptoTickDailyMixin:
     def get_document_name(self, date):
@@ -402,7 +548,7 @@ class CryptoTickDailyMixin:
                 if partition == date_to:
                     document_name = timestamp_from.strftime("%Y-%m-%dT%H")
                     collection = f"{self.firestore_cache.collection}-hot"
-                    data = FirestoreCache(collection).get(document_name)
+                    data = get_firestore_cache(collection).get(document_name)
                     if data:
                         self.pagination_id = self.get_pagination_id(data)
         return ok
@@ -413,42 +559,219 @@ class CryptoTickDailyMixin:
     def get_partition_decorator(self, date):
         return date.strftime("%Y%m%d")  # Partition by date
 
+    def get_timestamp_from_to(self, date):
+        timestamp_from = datetime.datetime.combine(
+            date, datetime.time.min, tzinfo=datetime.timezone.utc
+        )
+        return timestamp_from, timestamp_from + datetime.timedelta(days=1)
+
     def get_bigquery_loader(self, table_id, partition_decorator):
         return BigQueryDaily(table_id, partition_decorator)
 
     def iter_partition(self):
         period = pendulum.period(self.period_to, self.period_from)  # Reverse order
         for partition in period.range("days"):
-            self.partition = partition
-            self.partition_decorator = self.get_partition_decorator(partition)
+            self.set_partition(partition)
             yield partition
 
+    def set_partition(self, partition):
+        self.partition = partition
+        self.partition_decorator = self.get_partition_decorator(partition)
+
 
 class CryptoTickDailyS3Mixin(CryptoTickDailyMixin):
     def get_url(self, partition):
         raise NotImplementedError
 
+    @property
+    def column_types(self):
+        return COLUMN_TYPES
+
+    @property
+    def filter_symbols(self):
+        return None
+
     def main(self):
-        for partition in self.iter_partition():
-            self.partition_decorator = self.get_partition_decorator(partition)
-            document = self.get_document_name(partition)
-            if not self.has_data(partition):
-                url = self.get_url(partition)
-                if self.verbose:
-                    print(f"{self.log_prefix}: downloading {document}")
-                data_frame = HistoricalDownloader(url).main()
+        clear_firestore_caches()
+        self.preload()
+        try:
+            if self.workers > 1:
+                self.main_parallel()
+            elif self.prefetch:
+                self.main_prefetch()
+            else:
+                for partition in self.iter_partition():
+                    ok = self.process_partition(partition)
+                    # Partition boundary
+                    flush_firestore()
+                    if not ok:
+                        break
+                self.flush_batch()
+        finally:
+            flush_firestore()
+
+    def main_parallel(self):
+        # Only partitions without data are sent to workers.
+        partitions = [p for p in self.iter_partition() if not self.has_data(p)]
+        pending = deque()
+        failures = []
+        maybe_complete = False
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        ) as executor:
+            while partitions or pending:
+                # Bounded, so few partitions are downloaded after maybe complete.
+                while partitions and len(pending) < self.workers * 2:
+                    partition = partitions.pop(0)
+                    future = executor.submit(run_partition, self, partition)
+                    pending.append((partition, future))
+                partition, future = pending.popleft()
+                document = self.get_document_name(partition)
+                try:
+                    ok = future.result()
+                except Exception as exception:
+                    failures.append(document)
+                    print(f"{self.log_prefix}: {document} failed, {exception!r}")
+                else:
+                    # Partitions are reversed, so older partitions have no data.
+                    if not ok and not maybe_complete:
+                        maybe_complete = True
+                        partitions = []
+                        # Running partitions can't be cancelled, so unlike serially,
+                        # they are written. Their failures are still reported.
+                        pending = deque((p, f) for p, f in pending if not f.cancel())
+        if failures:
+            raise Exception(f"{self.log_prefix}: failed {', '.join(failures)}")
+        elif maybe_complete and self.verbose:
+            print(f"{self.log_prefix}: Maybe complete")
+
+    def main_prefetch(self):
+        # Download, parse, and write are stages, with queues between them.
+        # Each stage drains its queue, until None, so partitions that were
+        # downloaded before an error are written, as they would be serially.
+        stop = threading.Event()  # No more downloads
+        parse_failed = threading.Event()
+        write_failed = threading.Event()
+        downloads = queue.Queue(maxsize=self.prefetch)
+        data_frames = queue.Queue(maxsize=self.prefetch)
+        errors = []
+        stages = (
+            (self.download_stage, (downloads, stop, parse_failed), threading.Event()),
+            (
+                self.parse_stage,
+                (downloads, data_frames, stop, write_failed),
+                parse_failed,
+            ),
+            (self.write_stage, (data_frames,), write_failed),
+        )
+        threads = [
+            threading.Thread(target=run_stage, args=(stage, args, errors, stop, failed))
+            for stage, args, failed in stages
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def download_stage(self, downloads, stop, parse_failed):
+        crypto_tick = copy(self)  # Each stage has its own partition.
+        try:
+            for partition in crypto_tick.iter_partition():
+                if stop.is_set():
+                    break
+                if not crypto_tick.has_data(partition):
+                    url = crypto_tick.get_url(partition)
+                    if self.verbose:
+                        document = crypto_tick.get_document_name(partition)
+                        print(f"{self.log_prefix}: downloading {document}")
+                    historical_downloader = HistoricalDownloader(
+                        url,
+                        column_types=crypto_tick.column_types,
+                        symbols=crypto_tick.filter_symbols,
+                    )
+                    content = historical_downloader.download()
+                    item = (partition, historical_downloader, content)
+                    if not put_queue(downloads, item, parse_failed) or content is None:
+                        break
+        finally:
+            put_queue(downloads, None, parse_failed)
+
+    def parse_stage(self, downloads, data_frames, stop, write_failed):
+        crypto_tick = copy(self)
+        is_stopped = False
+        try:
+            while True:
+                item = downloads.get()
+                if item is None:
+                    break
+                # Maybe complete, or write failed, so only drained.
+                elif is_stopped:
+                    continue
+                partition, historical_downloader, content = item
+                crypto_tick.set_partition(partition)
+                data_frame = None
+                if content is not None:
+                    data_frame = historical_downloader.extract(content)
                 if data_frame is not None:
-                    df = self.filter_dataframe(data_frame)
+                    df = crypto_tick.filter_dataframe(data_frame)
                     if len(df):
-                        self.process_dataframe(df)
-                    else:
-                        if self.verbose:
-                            print(f"{self.log_prefix}: Maybe complete")
-                        break
+                        data_frame = crypto_tick.parse_dataframe(df)
+                        item = (partition, data_frame)
+                        is_stopped = not put_queue(data_frames, item, write_failed)
+                        continue
+                if self.verbose:
+                    print(f"{self.log_prefix}: Maybe complete")
+                stop.set()
+                is_stopped = True
+        finally:
+            put_queue(data_frames, None, write_failed)
+
+    def write_stage(self, data_frames):
+        crypto_tick = copy(self)
+        while True:
+            item = data_frames.get()
+            if item is None:
+                break
+            partition, data_frame = item
+            crypto_tick.set_partition(partition)
+            if len(data_frame):
+                crypto_tick.write(data_frame)
+            else:
+                print(f"{self.log_prefix}: No data")
+            # Partition boundary
+            flush_firestore()
+        crypto_tick.flush_batch()
+
+    def process_partition(self, partition):
+        """Process partition, returns False if maybe complete."""
+        self.partition_decorator = self.get_partition_decorator(partition)
+        document = self.get_document_name(partition)
+        if not self.has_data(partition):
+            url = self.get_url(partition)
+            if self.verbose:
+                print(f"{self.log_prefix}: downloading {document}")
+            data_frame = HistoricalDownloader(
+                url,
+                column_types=self.column_types,
+                symbols=self.filter_symbols,
+            ).main()
+            if data_frame is not None:
+                df = self.filter_dataframe(data_frame)
+                if len(df):
+                    self.process_dataframe(df)
                 else:
                     if self.verbose:
                         print(f"{self.log_prefix}: Maybe complete")
-                    break
+                    return False
+            else:
+                if self.verbose:
+                    print(f"{self.log_prefix}: Maybe complete")
+                return False
+        return True
 
     def filter_dataframe(self, data_frame):
         return data_frame
@@ -474,10 +797,70 @@ class CryptoTickDailyS3Mixin(CryptoTickDailyMixin):
         # Columns
         columns = get_schema_columns(self.schema)
         data_frame = data_frame[columns]
-        # BigQuery
-        suffix = self.get_suffix(sep="_")
-        table_id = get_table_id(self.exchange, suffix=suffix)
-        bigquery_loader = self.get_bigquery_loader(table_id, self.partition_decorator)
-        bigquery_loader.write_table(self.schema, data_frame)
+        # Skip load, if a re-run has identical data.
+        fingerprint = get_fingerprint(data_frame)
+        if self.is_unchanged(fingerprint):
+            return
+        if self.batch:
+            self.write_batch(data_frame, fingerprint)
+        else:
+            # BigQuery
+            suffix = self.get_suffix(sep="_")
+            table_id = get_table_id(self.exchange, suffix=suffix)
+            bigquery_loader = self.get_bigquery_loader(
+                table_id, self.partition_decorator
+            )
+            bigquery_loader.write_table(self.schema, data_frame)
+            self.on_write(table_id, data_frame, fingerprint)
+
+    def on_write(self, table_id, data_frame, fingerprint):
         # Firebase
-        self.set_firebase(data_frame, is_complete=True)
+        self.set_firebase(data_frame, is_complete=True, fingerprint=fingerprint)
+        # Aggregated, without reading back from BigQuery
+        if self.aggregate:
+            self.write_aggregated(table_id, data_frame)
+
+    def write_batch(self, data_frame, fingerprint):
+        """Partitions are batched, until rows or bytes are exceeded."""
+        self.batch_data_frames.append((self.partition, data_frame, fingerprint))
+        # Running totals, so each data frame is measured once.
+        self.batch_rows += len(data_frame)
+        self.batch_bytes += data_frame.memory_usage(deep=True).sum()
+        if self.batch_rows >= MAX_BATCH_ROWS or self.batch_bytes >= MAX_BATCH_BYTES:
+            self.flush_batch()
+
+    def flush_batch(self):
+        """One load job for batched partitions, then Firebase."""
+        if self.batch_data_frames:
+            partition = self.partition
+            suffix = self.get_suffix(sep="_")
+            table_id = get_table_id(self.exchange, suffix=suffix)
+            data_frames = {
+                self.get_partition_decorator(p): df
+                for p, df, _ in self.batch_data_frames
+            }
+            bigquery_loader = self.get_bigquery_loader(table_id, None)
+            bigquery_loader.write_partitions(self.schema, data_frames)
+            # Aggregated, also with one load job.
+            aggregated = {}
+            if self.aggregate:
+                for partition_decorator, df in data_frames.items():
+                    schema, aggregated[partition_decorator] = self.get_aggregated(df)
+                bigquery_loader = self.get_bigquery_loader(
+                    f"{table_id}_aggregated", None
+                )
+                bigquery_loader.write_partitions(schema, aggregated)
+            # Firebase, once partitions are loaded.
+            for p, df, fingerprint in self.batch_data_frames:
+                self.set_partition(p)
+                self.set_firebase(df, is_complete=True, fingerprint=fingerprint)
+                if self.aggregate:
+                    self.set_firebase(
+                        aggregated[self.partition_decorator],
+                        attr="firestore_aggregated",
+                        is_complete=True,
+                    )
+            self.batch_data_frames = []
+            self.batch_rows = 0
+            self.batch_bytes = 0
+            self.set_partition(partition)
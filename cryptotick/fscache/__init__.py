@@ -1,4 +1,18 @@
 from .fscache import FirestoreCache
-from .lib import firestore_data, get_collection_name
+from .lib import (
+    clear_firestore_caches,
+    firestore_data,
+    get_collection_name,
+    get_firestore_cache,
+)
+from .writer import FirestoreWriter, flush_firestore
 
-__all__ = ["firestore_data", "get_collection_name", "FirestoreCache"]
+__all__ = [
+    "clear_firestore_caches",
+    "firestore_data",
+    "get_collection_name",
+    "get_firestore_cache",
+    "flush_firestore",
+    "FirestoreCache",
+    "FirestoreWriter",
+]
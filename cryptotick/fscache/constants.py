@@ -0,0 +1,3 @@
+MAX_GET_ALL = 300  # Documents per batch get
+MAX_BATCH_WRITES = 500  # Firestore limit
+MAX_RETRY = 5
@@ -1,4 +1,6 @@
 import os
+import threading
+from copy import copy
 
 import firebase_admin
 from firebase_admin import firestore
@@ -6,11 +8,18 @@ from firebase_admin.credentials import Certificate
 
 from ..constants import FIREBASE_ADMIN_CREDENTIALS, PROJECT_ID
 from ..utils import is_local
+from .constants import MAX_GET_ALL
+from .writer import get_firestore_writer
 
 
 class FirestoreCache:
+    """Read through, and write through, cache of documents."""
+
     def __init__(self, collection):
         self.collection = collection
+        self.documents = {}
+        self.queries = {}
+        self.lock = threading.Lock()
 
         if "FIREBASE_INIT" not in os.environ:
             if is_local():
@@ -34,11 +43,36 @@ class FirestoreCache:
             return True
 
     def get(self, document):
+        with self.lock:
+            if document in self.documents:
+                return self.documents[document]
         data = self.firestore.collection(self.collection).document(document).get()
-        if data:
-            return data.to_dict()
+        data = data.to_dict() if data else None
+        with self.lock:
+            self.documents[document] = data
+        return data
+
+    def get_all(self, documents):
+        """Get documents in bulk, and cache them."""
+        with self.lock:
+            missing = [d for d in documents if d not in self.documents]
+        collection = self.firestore.collection(self.collection)
+        for index in range(0, len(missing), MAX_GET_ALL):
+            batch = missing[index : index + MAX_GET_ALL]
+            data = {document: None for document in batch}
+            references = [collection.document(document) for document in batch]
+            for snapshot in self.firestore.get_all(references):
+                data[snapshot.id] = snapshot.to_dict()
+            with self.lock:
+                self.documents.update(data)
+        with self.lock:
+            return {document: self.documents[document] for document in documents}
 
     def get_one(self, where=None, order_by=None, direction=firestore.Query.ASCENDING):
+        key = (tuple(where or ()), order_by, direction)
+        with self.lock:
+            if key in self.queries:
+                return self.queries[key]
         query = self.firestore.collection(self.collection)
         if where:
             query = query.where(*where)
@@ -46,11 +80,33 @@ class FirestoreCache:
             query = query.order_by(order_by, direction=direction)
         query = query.limit(1)
         results = [r for r in query.stream()]
-        if results:
-            return results[0].to_dict()
+        data = results[0].to_dict() if results else None
+        with self.lock:
+            self.queries[key] = data
+        return data
 
     def set(self, document, data):
         self.firestore.collection(self.collection).document(document).set(data)
+        with self.lock:
+            self.documents[document] = copy(data)
+            # Queries may have changed.
+            self.queries.clear()
+
+    def set_async(self, document, data, on_commit=None):
+        """Write in the background, though cached now."""
+        reference = self.firestore.collection(self.collection).document(document)
+        get_firestore_writer(self.firestore).set(reference, data, on_commit=on_commit)
+        with self.lock:
+            self.documents[document] = copy(data)
+            self.queries.clear()
 
     def delete(self, document):
         self.firestore.collection(self.collection).document(document).delete()
+        with self.lock:
+            self.documents[document] = None
+            self.queries.clear()
+
+    def clear(self):
+        with self.lock:
+            self.documents.clear()
+            self.queries.clear()
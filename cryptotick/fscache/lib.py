@@ -1,11 +1,32 @@
 import datetime
 import os
+import threading
 from copy import copy
 
 from google.api_core.datetime_helpers import DatetimeWithNanoseconds
 
 from ..constants import FIRESTORE_COLLECTIONS
 from ..utils import set_env_list
+from .fscache import FirestoreCache
+
+FIRESTORE_CACHES = {}
+LOCK = threading.Lock()
+
+
+def get_firestore_cache(collection):
+    """Caches are shared by collection, for the run."""
+    with LOCK:
+        if collection not in FIRESTORE_CACHES:
+            FIRESTORE_CACHES[collection] = FirestoreCache(collection)
+        return FIRESTORE_CACHES[collection]
+
+
+def clear_firestore_caches():
+    """Other runs may write documents, e.g. in a reused Cloud Functions
+    instance, so caches are cleared at the start of each run."""
+    with LOCK:
+        for firestore_cache in FIRESTORE_CACHES.values():
+            firestore_cache.clear()
 
 
 def get_collection_name(exchange, suffix=""):
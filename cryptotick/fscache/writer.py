@@ -0,0 +1,94 @@
+import atexit
+import queue
+import threading
+import time
+
+from google.api_core.exceptions import DeadlineExceeded, ServiceUnavailable
+
+from .constants import MAX_BATCH_WRITES, MAX_RETRY
+
+FIRESTORE_WRITERS = {}
+LOCK = threading.Lock()
+
+
+def get_firestore_writer(client):
+    """Writers are shared by client, for the run."""
+    with LOCK:
+        key = id(client)
+        if key not in FIRESTORE_WRITERS:
+            FIRESTORE_WRITERS[key] = FirestoreWriter(client)
+        return FIRESTORE_WRITERS[key]
+
+
+def flush_firestore():
+    with LOCK:
+        firestore_writers = list(FIRESTORE_WRITERS.values())
+    for firestore_writer in firestore_writers:
+        firestore_writer.flush()
+
+
+atexit.register(flush_firestore)
+
+
+class FirestoreWriter:
+    """Background thread, that commits writes in batches."""
+
+    def __init__(self, client, max_batch_writes=MAX_BATCH_WRITES, retry=MAX_RETRY):
+        self.client = client
+        self.max_batch_writes = max_batch_writes
+        self.retry = retry
+        self.queue = queue.Queue()
+        self.errors = []
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def set(self, reference, data, on_commit=None):
+        self.start()
+        self.queue.put((reference, data, on_commit))
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            writes = [self.queue.get()]
+            # Writes that are already queued are committed together.
+            while len(writes) < self.max_batch_writes:
+                try:
+                    writes.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.commit(writes)
+                for _, _, on_commit in writes:
+                    if on_commit:
+                        on_commit()
+            except Exception as exception:
+                self.errors.append(exception)
+            finally:
+                for _ in writes:
+                    self.queue.task_done()
+
+    def commit(self, writes):
+        for i in range(self.retry):
+            batch = self.client.batch()
+            for reference, data, _ in writes:
+                batch.set(reference, data)
+            try:
+                batch.commit()
+            except (DeadlineExceeded, ServiceUnavailable) as exception:
+                if i == self.retry - 1:
+                    raise exception
+                time.sleep(2**i)  # Backoff
+            else:
+                return
+
+    def flush(self):
+        """Barrier, until queued writes are committed."""
+        self.queue.join()
+        if self.errors:
+            errors, self.errors = self.errors, []
+            raise errors[0]
@@ -0,0 +1,15 @@
+from .lib import (
+    close_async_clients,
+    get_async_client,
+    get_client,
+    get_client_stats,
+    run_async,
+)
+
+__all__ = [
+    "get_client",
+    "get_async_client",
+    "close_async_clients",
+    "run_async",
+    "get_client_stats",
+]
@@ -0,0 +1,5 @@
+TIMEOUT = 60
+CONNECT_TIMEOUT = 10
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+
+from ..constants import HTTP2
+from .constants import (
+    CONNECT_TIMEOUT,
+    KEEPALIVE_EXPIRY,
+    MAX_CONNECTIONS,
+    MAX_KEEPALIVE_CONNECTIONS,
+    TIMEOUT,
+)
+
+CLIENTS = {}
+ASYNC_CLIENTS = weakref.WeakKeyDictionary()  # By event loop
+STATS = {}
+CONNECTIONS = {}
+LOCK = threading.Lock()
+
+
+def is_http2():
+    if os.environ.get(HTTP2):
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        else:
+            return True
+    return False
+
+
+def get_limits():
+    kwargs = {
+        "max_connections": MAX_CONNECTIONS,
+        "max_keepalive_connections": MAX_KEEPALIVE_CONNECTIONS,
+    }
+    # Before httpx 0.18, keepalive expiry is not configurable.
+    try:
+        return httpx.Limits(keepalive_expiry=KEEPALIVE_EXPIRY, **kwargs)
+    except TypeError:
+        return httpx.Limits(**kwargs)
+
+
+def get_client_kwargs():
+    return {
+        "http2": is_http2(),
+        "timeout": httpx.Timeout(TIMEOUT, connect=CONNECT_TIMEOUT),
+        "limits": get_limits(),
+    }
+
+
+def get_client(url):
+    """Clients are shared by host, for keep-alive."""
+    host = httpx.URL(url).host
+    with LOCK:
+        if host not in CLIENTS:
+            client = httpx.Client(**get_client_kwargs())
+            client.event_hooks = {
+                "response": [lambda response: update_stats(client, response)]
+            }
+            CLIENTS[host] = client
+        return CLIENTS[host]
+
+
+def get_async_client(url):
+    """Async clients are shared by host, within the running event loop."""
+    host = httpx.URL(url).host
+    loop = asyncio.get_running_loop()
+    with LOCK:
+        clients = ASYNC_CLIENTS.setdefault(loop, {})
+        if host not in clients:
+            client = httpx.AsyncClient(**get_client_kwargs())
+            client.event_hooks = {
+                "response": [lambda response: async_update_stats(client, response)]
+            }
+            clients[host] = client
+        return clients[host]
+
+
+async def close_async_clients():
+    with LOCK:
+        clients = ASYNC_CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+def run_async(coroutine):
+    """Run coroutine, then close async clients of its event loop."""
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(main())
+
+
+def get_pool_connections(client):
+    """Connections of the httpcore pool, as httpx 0.16 responses don't have them."""
+    # After httpx 0.18, the transport wraps the pool.
+    pool = getattr(client._transport, "_pool", client._transport)
+    connections = getattr(pool, "connections", None)
+    # Before httpcore 0.14, connections are by origin.
+    if connections is None:
+        connections = [
+            connection
+            for origin in getattr(pool, "_connections", {}).values()
+            for connection in origin
+        ]
+    return connections
+
+
+def update_stats(client, response):
+    host = response.request.url.host
+    # The connection of the response is in the pool, until the response is closed.
+    connections = get_pool_connections(client)
+    with LOCK:
+        stats = STATS.setdefault(host, {"requests": 0, "connections": 0})
+        seen = CONNECTIONS.setdefault(host, weakref.WeakSet())
+        stats["requests"] += 1
+        for connection in connections:
+            if connection not in seen:
+                stats["connections"] += 1
+                seen.add(connection)
+
+
+async def async_update_stats(client, response):
+    update_stats(client, response)
+
+
+def get_client_stats():
+    with LOCK:
+        return {
+            host: {**stats, "reused": stats["requests"] - stats["connections"]}
+            for host, stats in STATS.items()
+        }
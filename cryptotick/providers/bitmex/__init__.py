@@ -1,4 +1,11 @@
-from .bitmex import bitmex_futures, bitmex_perpetual
+from .bitmex import bitmex_futures, bitmex_multi_symbol, bitmex_perpetual
 from .constants import BITMEX, XBT, XBTUSD
 
-__all__ = ["BITMEX", "XBT", "XBTUSD", "bitmex_perpetual", "bitmex_futures"]
+__all__ = [
+    "BITMEX",
+    "XBT",
+    "XBTUSD",
+    "bitmex_perpetual",
+    "bitmex_futures",
+    "bitmex_multi_symbol",
+]
@@ -1,11 +1,19 @@
 import datetime
 import re
-import time
 
-import httpx
 from yapic import json
 
-from .constants import API_URL, BITMEX, MAX_API_RESULTS, MIN_DATE, MONTHS, XBT, XBTUSD
+from ...ratelimiter import get_rate_limiter, rate_limited_get
+from .constants import (
+    API_URL,
+    BITMEX,
+    MAX_API_REQUESTS_PER_SECOND,
+    MAX_API_RESULTS,
+    MIN_DATE,
+    MONTHS,
+    XBT,
+    XBTUSD,
+)
 
 
 def parse_api_timestamp(timestamp):
@@ -98,12 +106,11 @@ def get_api_response(url, end_time=None):
     url += "&count=500&reverse=true"
     if end_time:
         url += f"&endTime={end_time}"
-    response = httpx.get(url)
+    rate_limiter = get_rate_limiter(BITMEX, MAX_API_REQUESTS_PER_SECOND)
+    # Retries while rate limited.
+    response = rate_limited_get(rate_limiter, url)
     if response.status_code == 200:
         return response
-    elif response.status_code == 429:
-        retry = response.headers.get("Retry-After", 1)
-        time.sleep(retry)
     else:
         exchange = BITMEX.capitalize()
         raise Exception(f"{exchange}: API {response.status_code}")
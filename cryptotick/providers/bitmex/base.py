@@ -17,6 +17,10 @@ class BaseBitmex(CryptoTick):
         period_from=None,
         period_to=None,
         aggregate=False,
+        workers=1,
+        prefetch=0,
+        batch=False,
+        force=False,
         verbose=False,
     ):
         super().__init__(
@@ -25,6 +29,10 @@ class BaseBitmex(CryptoTick):
             period_from=period_from,
             period_to=period_to,
             aggregate=aggregate,
+            workers=workers,
+            prefetch=prefetch,
+            batch=batch,
+            force=force,
             verbose=verbose,
         )
 
@@ -34,6 +42,10 @@ class BitmexDailyS3Mixin(CryptoTickDailyS3Mixin):
         date_string = date.strftime("%Y%m%d")
         return f"{URL}{date_string}.csv.gz"
 
+    @property
+    def filter_symbols(self):
+        return [self.symbol]
+
     def filter_dataframe(self, data_frame):
         return data_frame[data_frame.symbol == self.symbol]
 
@@ -94,6 +106,10 @@ class BitmexFuturesDailyS3Mixin(BitmexDailyS3Mixin):
             if s["listing"].date() <= self.partition <= s["expiry"].date()
         ]
 
+    @property
+    def filter_symbols(self):
+        return [s["symbol"] for s in self.active_symbols]
+
     def has_symbols(self, data):
         return all([data.get(s["symbol"], None) for s in self.active_symbols])
 
@@ -1,5 +1,6 @@
 from ...utils import parse_period_from_to
 from .futures import BitmexFuturesDailyPartition  # BitmexFuturesHourlyPartition
+from .multi_symbol import BitmexMultiSymbolDailyS3
 from .perpetual import BitmexPerpetualDailyPartition  # BitmexPerpetualHourlyPartition,
 
 
@@ -8,6 +9,10 @@ def bitmex_perpetual(
     period_from: str = None,
     period_to: str = None,
     aggregate: bool = False,
+    workers: int = 1,
+    prefetch: int = 0,
+    batch: bool = False,
+    force: bool = False,
     verbose: bool = False,
 ):
     assert symbol
@@ -27,6 +32,10 @@ def bitmex_perpetual(
             period_from=date_from,
             period_to=date_to,
             aggregate=aggregate,
+            workers=workers,
+            prefetch=prefetch,
+            batch=batch,
+            force=force,
             verbose=verbose,
         ).main()
 
@@ -36,6 +45,10 @@ def bitmex_futures(
     period_from: str = None,
     period_to: str = None,
     aggregate: bool = False,
+    workers: int = 1,
+    prefetch: int = 0,
+    batch: bool = False,
+    force: bool = False,
     verbose: bool = False,
 ):
     assert root_symbol
@@ -55,5 +68,41 @@ def bitmex_futures(
             period_from=date_from,
             period_to=date_to,
             aggregate=aggregate,
+            workers=workers,
+            prefetch=prefetch,
+            batch=batch,
+            force=force,
             verbose=verbose,
         ).main()
+
+
+def bitmex_multi_symbol(
+    symbols: str = None,
+    root_symbol: str = None,
+    period_from: str = None,
+    period_to: str = None,
+    aggregate: bool = False,
+    batch: bool = False,
+    force: bool = False,
+    verbose: bool = False,
+):
+    symbols = [s for s in (symbols or "").split(" ") if s]
+    assert symbols or root_symbol
+    timestamp_from, timestamp_to, date_from, date_to = parse_period_from_to(
+        period_from=period_from, period_to=period_to
+    )
+    if date_from and date_to:
+        kwargs = {
+            "period_from": date_from,
+            "period_to": date_to,
+            "aggregate": aggregate,
+            "batch": batch,
+            "force": force,
+            "verbose": verbose,
+        }
+        partitions = [BitmexPerpetualDailyPartition(s, **kwargs) for s in symbols]
+        if root_symbol:
+            partitions.append(BitmexFuturesDailyPartition(root_symbol, **kwargs))
+        BitmexMultiSymbolDailyS3(
+            partitions, period_from=date_from, period_to=date_to, verbose=verbose
+        ).main()
@@ -7,6 +7,7 @@ URL = "https://s3-eu-west-1.amazonaws.com/public.bitmex.com/data/trade/"
 
 API_URL = "https://www.bitmex.com/api/v1"
 MAX_API_RESULTS = 500
+MAX_API_REQUESTS_PER_SECOND = 0.5  # 30 per minute
 
 uBTC = 0.000001  # 0.001 mXBT
 
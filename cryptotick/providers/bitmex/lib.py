@@ -1,20 +1,36 @@
 import re
 
+import numpy as np
+
 from .constants import BCHUSD, ETHUSD, LTCUSD, XBTUSD, XRPUSD, uBTC
 
 XBT_FUTURES_REGEX = re.compile(r"^XBT(\w)\d+$")
 
 
-def calc_notional(x):
-    if x.symbol == XBTUSD or XBT_FUTURES_REGEX.match(x.symbol):
-        return x.volume / x.price
-    elif x.symbol.startswith(ETHUSD) or x.symbol.startswith(BCHUSD):
-        return x.volume * x.price * uBTC
-    elif x.symbol.startswith(LTCUSD):
-        return x.volume * x.price * uBTC * 2
-    elif x.symbol == XRPUSD:
-        return x.volume * x.price * uBTC / 20
-    elif "USD" in x.symbol:
+def calc_notional(data_frame):
+    notional = np.zeros(len(data_frame))
+    symbols = data_frame.symbol.to_numpy()
+    volume = data_frame.volume.to_numpy()
+    price = data_frame.price.to_numpy()
+    # Data is filtered by symbol, so there are few unique symbols.
+    for symbol in np.unique(symbols):
+        is_symbol = symbols == symbol
+        notional[is_symbol] = calc_symbol_notional(
+            symbol, volume[is_symbol], price[is_symbol]
+        )
+    return notional
+
+
+def calc_symbol_notional(symbol, volume, price):
+    if symbol == XBTUSD or XBT_FUTURES_REGEX.match(symbol):
+        return volume / price
+    elif symbol.startswith(ETHUSD) or symbol.startswith(BCHUSD):
+        return volume * price * uBTC
+    elif symbol.startswith(LTCUSD):
+        return volume * price * uBTC * 2
+    elif symbol == XRPUSD:
+        return volume * price * uBTC / 20
+    elif "USD" in symbol:
         return 0
     else:
-        return x.volume * x.price
+        return volume * price
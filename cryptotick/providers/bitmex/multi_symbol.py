@@ -0,0 +1,84 @@
+import pandas as pd
+import pendulum
+
+from ...fscache import clear_firestore_caches, flush_firestore
+from ...s3downloader import HistoricalDownloader
+from .constants import BITMEX
+
+
+class BitmexMultiSymbolDailyS3:
+    """Download each date once, for the perpetual and futures partitions."""
+
+    def __init__(self, partitions, period_from=None, period_to=None, verbose=False):
+        self.partitions = partitions
+        self.period_from = period_from
+        self.period_to = period_to
+        self.verbose = verbose
+
+    @property
+    def log_prefix(self):
+        return BITMEX.capitalize()
+
+    def iter_partition(self):
+        period = pendulum.period(self.period_to, self.period_from)  # Reverse order
+        for partition in period.range("days"):
+            yield partition
+
+    def main(self):
+        clear_firestore_caches()
+        partitions = list(self.partitions)
+        try:
+            for partition in self.iter_partition():
+                pending = []
+                for p in partitions:
+                    p.set_partition(partition)
+                    if not p.has_data(partition):
+                        pending.append(p)
+                if pending:
+                    data_frame = self.get_data_frame(pending, partition)
+                    if data_frame is not None:
+                        # Split once by symbol, not by boolean mask per partition.
+                        groups = {
+                            symbol: df
+                            for symbol, df in data_frame.groupby("symbol", sort=False)
+                        }
+                        for p in pending:
+                            df = self.get_symbols_data_frame(groups, p.filter_symbols)
+                            if len(df):
+                                p.process_dataframe(df)
+                            else:
+                                if p.verbose:
+                                    print(f"{p.log_prefix}: Maybe complete")
+                                partitions.remove(p)
+                    else:
+                        if self.verbose:
+                            print(f"{self.log_prefix}: Maybe complete")
+                        break
+                # Partition boundary
+                flush_firestore()
+                if not partitions:
+                    break
+            for p in self.partitions:
+                p.flush_batch()
+        finally:
+            flush_firestore()
+
+    def get_data_frame(self, partitions, partition):
+        first = partitions[0]
+        url = first.get_url(partition)
+        symbols = sorted({s for p in partitions for s in p.filter_symbols})
+        if self.verbose:
+            document = first.get_document_name(partition)
+            print(f"{self.log_prefix}: downloading {document}")
+        return HistoricalDownloader(
+            url, column_types=first.column_types, symbols=symbols
+        ).main()
+
+    def get_symbols_data_frame(self, groups, symbols):
+        data_frames = [groups[symbol] for symbol in symbols if symbol in groups]
+        if len(data_frames) == 1:
+            return data_frames[0]
+        elif len(data_frames):
+            # Order of the file
+            return pd.concat(data_frames).sort_index()
+        return pd.DataFrame([])
@@ -1,5 +1,4 @@
-import httpx
-
+from ...httpclient import get_client
 from ...utils import date_range, publish
 from .futures import BitmexFuturesETL
 from .perpetual import BitmexPerpetualETL
@@ -10,7 +9,7 @@ class BitmexPerpetualETLTrigger(BitmexPerpetualETL):
         for date in date_range(self.date_from, self.date_to, reverse=True):
             if not self.has_data(date):
                 url = self.get_url(date)
-                response = httpx.head(url)
+                response = get_client(url).head(url)
                 if response.status_code == 200:
                     data = {
                         "symbols": " ".join(self.symbols),
@@ -25,7 +24,7 @@ class BitmexFuturesETLTrigger(BitmexFuturesETL):
         for date in date_range(self.date_from, self.date_to, reverse=True):
             if not self.has_data(date):
                 url = self.get_url(date)
-                response = httpx.head(url)
+                response = get_client(url).head(url)
                 if response.status_code == 200:
                     data = {
                         "root_symbol": self.root_symbol,
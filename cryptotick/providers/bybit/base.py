@@ -1,8 +1,9 @@
-import httpx
 import pandas as pd
+import pyarrow as pa
 
 from ...cryptotick import CryptoTick, CryptoTickDailyS3Mixin
-from ...s3downloader import calculate_notional
+from ...httpclient import get_client
+from ...s3downloader import COLUMN_TYPES, calculate_notional
 from .constants import BYBIT, URL
 from .lib import calc_notional
 
@@ -14,6 +15,10 @@ class BaseBybit(CryptoTick):
         period_from=None,
         period_to=None,
         aggregate=False,
+        workers=1,
+        prefetch=0,
+        batch=False,
+        force=False,
         verbose=False,
     ):
         super().__init__(
@@ -22,6 +27,10 @@ class BaseBybit(CryptoTick):
             period_from=period_from,
             period_to=period_to,
             aggregate=aggregate,
+            workers=workers,
+            prefetch=prefetch,
+            batch=batch,
+            force=force,
             verbose=verbose,
         )
 
@@ -29,12 +38,17 @@ class BaseBybit(CryptoTick):
 class BybitDailyS3Mixin(CryptoTickDailyS3Mixin):
     def get_url(self, date):
         directory = f"{URL}{self.symbol}/"
-        response = httpx.get(directory)
+        response = get_client(directory).get(directory)
         if response.status_code == 200:
             return f"{URL}{self.symbol}/{self.symbol}{date.isoformat()}.csv.gz"
         else:
             print(f"{self.exchange.capitalize()} {self.symbol}: No data")
 
+    @property
+    def column_types(self):
+        # Bybit timestamps are seconds since epoch.
+        return {**COLUMN_TYPES, "timestamp": pa.float64()}
+
     def parse_dataframe(self, data_frame):
         # No false positives.
         # Source: https://pandas.pydata.org/pandas-docs/stable/user_guide/
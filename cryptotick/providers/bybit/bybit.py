@@ -7,6 +7,10 @@ def bybit_perpetual(
     period_from: str = None,
     period_to: str = None,
     aggregate: bool = False,
+    workers: int = 1,
+    prefetch: int = 0,
+    batch: bool = False,
+    force: bool = False,
     verbose: bool = False,
 ):
     assert symbol
@@ -26,5 +30,9 @@ def bybit_perpetual(
             period_from=date_from,
             period_to=date_to,
             aggregate=aggregate,
+            workers=workers,
+            prefetch=prefetch,
+            batch=batch,
+            force=force,
             verbose=verbose,
         ).main()
@@ -1,2 +1,2 @@
-def calc_notional(x):
-    return x.volume / x.price
+def calc_notional(data_frame):
+    return data_frame.volume / data_frame.price
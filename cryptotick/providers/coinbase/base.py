@@ -1,7 +1,12 @@
+import asyncio
+
+import numpy as np
+from ciso8601 import parse_datetime
 from yapic import json
 
 from ...cryptotick import CryptoTickREST
-from .constants import COINBASE, MAX_REQUESTS_PER_SECOND, URL
+from ...httpclient import get_async_client, run_async
+from .constants import COINBASE, MAX_REQUESTS_PER_SECOND, MAX_RESULTS, URL
 
 
 class BaseCoinbase(CryptoTickREST):
@@ -11,6 +16,7 @@ class BaseCoinbase(CryptoTickREST):
         period_from=None,
         period_to=None,
         aggregate=False,
+        shards=0,
         verbose=False,
     ):
         super().__init__(
@@ -22,12 +28,13 @@ class BaseCoinbase(CryptoTickREST):
             verbose=verbose,
         )
         self.api_symbol = api_symbol
+        self.shards = shards
+        self.trade_ids = {}  # By timestamp, as partitions share boundaries
 
-    @property
-    def url(self):
+    def get_url(self, pagination_id):
         url = f"{URL}/products/{self.api_symbol}/trades"
-        if self.pagination_id:
-            return f"{url}?after={self.pagination_id}"
+        if pagination_id:
+            return f"{url}?after={pagination_id}"
         return url
 
     @property
@@ -38,6 +45,13 @@ class BaseCoinbase(CryptoTickREST):
     def can_paginate(self):
         return self.pagination_id is None or int(self.pagination_id) > 1
 
+    def get_next_pagination_ids(self, n):
+        # Trade ids are dense, so next pagination ids are likely.
+        if self.pagination_id:
+            pagination_ids = [self.pagination_id - (i * MAX_RESULTS) for i in range(n)]
+            return [p for p in pagination_ids if p > 1]
+        return [self.pagination_id]
+
     def get_pagination_id(self, data):
         if data and "open" in data:
             pagination_id = int(data["open"]["index"])
@@ -56,7 +70,7 @@ class BaseCoinbase(CryptoTickREST):
         """
         # Coinbase says cursor pagination can be unintuitive at first.
         # After gets data older than cb-after pagination id.
-        data = json.loads(response.content)
+        data = json.loads(response.content, parse_date=False)
         trades = self.parse_data(data)
         # Update pagination_id
         pagination_id = response.headers.get("cb-after", None)
@@ -71,31 +85,86 @@ class BaseCoinbase(CryptoTickREST):
             self.maybe_complete = True
         return self.update_trades(trades)
 
-    def get_uid(self, trade):
-        return str(trade["trade_id"])
-
-    def get_timestamp(self, trade):
-        return trade["time"]
-
-    def get_nanoseconds(self, trade):
-        return 0
+    def get_sharded_trades(self, timestamp_from, timestamp_to):
+        return run_async(self.get_sharded_trades_async(timestamp_from, timestamp_to))
 
-    def get_price(self, trade):
-        return float(trade["price"])
-
-    def get_volume(self, trade):
-        return float(trade["price"]) * float(trade["size"])
-
-    def get_notional(self, trade):
-        return float(trade["size"])
+    async def get_sharded_trades_async(self, timestamp_from, timestamp_to):
+        """
+        Trade ids are dense, so trade ids of the partition are split into shards,
+        which are requested concurrently.
+        """
+        client = get_async_client(URL)
+        data = await self.get_page(client, None)
+        last_trade_id = data[0]["trade_id"] if data else 0
+        start = await self.get_trade_id(client, timestamp_from, last_trade_id)
+        stop = await self.get_trade_id(client, timestamp_to, last_trade_id)
+        pagination_ids = list(range(stop, start, -MAX_RESULTS))
+        shards = [
+            shard for shard in np.array_split(pagination_ids, self.shards) if len(shard)
+        ]
+        pages = await asyncio.gather(
+            *[self.get_shard(client, shard) for shard in shards]
+        )
+        # Pages may overlap, if there are missing trade ids.
+        data = {
+            trade["trade_id"]: trade
+            for page in pages
+            for trade in page
+            if start <= trade["trade_id"] < stop
+        }
+        trades = self.parse_data([data[key] for key in sorted(data, reverse=True)])
+        return trades, start, stop, last_trade_id
+
+    async def get_shard(self, client, pagination_ids):
+        data = []
+        for pagination_id in pagination_ids:
+            data += await self.get_page(client, int(pagination_id))
+        return data
+
+    async def get_trade_id(self, client, timestamp, last_trade_id):
+        """First trade id at, or after, timestamp by bisection."""
+        # Start of the previous partition, is stop of the next partition.
+        if timestamp in self.trade_ids:
+            return self.trade_ids[timestamp]
+        low = 1
+        high = last_trade_id + 1
+        while low < high:
+            middle = (low + high) // 2
+            # After gets data older than pagination id.
+            data = await self.get_page(client, middle + 1)
+            if data and parse_datetime(data[0]["time"]) >= timestamp:
+                high = data[0]["trade_id"]
+            else:
+                low = middle + 1
+        self.trade_ids[timestamp] = low
+        return low
+
+    async def get_page(self, client, pagination_id):
+        url = self.get_url(pagination_id)
+        response = await self.get_async_response(client, url)
+        if response.status_code == 200:
+            return json.loads(response.content, parse_date=False)
+        else:
+            raise Exception(f"{response.status_code}: {response.content}")
 
-    def get_tick_rule(self, trade):
+    @property
+    def column_mapping(self):
+        return {
+            "uid": "trade_id",
+            "timestamp": "time",
+            "price": "price",
+            "notional": "size",
+            "tickRule": "side",
+            "index": "trade_id",
+        }
+
+    def get_volume(self, price, notional):
+        return price * notional
+
+    def get_tick_rule(self, side):
         # Buy side indicates a down-tick because the maker was a buy order and
         # their order was removed. Conversely, sell side indicates an up-tick.
-        return 1 if trade["side"] == "sell" else -1
-
-    def get_index(self, trade):
-        return int(trade["trade_id"])
+        return np.where(side == "sell", 1, -1)
 
     def assert_is_complete(self, trades):
         assert self.firestore_cache.get_one(
@@ -7,6 +7,7 @@ def coinbase_spot(
     period_from: str = None,
     period_to: str = None,
     aggregate: bool = False,
+    shards: int = 0,
     verbose: bool = False,
 ):
     assert api_symbol
@@ -27,5 +28,6 @@ def coinbase_spot(
             period_from=date_from,
             period_to=date_to,
             aggregate=aggregate,
+            shards=shards,
             verbose=verbose,
         ).main()
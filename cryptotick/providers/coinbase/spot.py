@@ -1,6 +1,7 @@
 import datetime
 
 from ...cryptotick import CryptoTickDailyMixin, CryptoTickHourlyMixin
+from ...fscache import clear_firestore_caches, flush_firestore
 from .base import BaseCoinbase
 from .constants import BTCUSD, ETHUSD
 
@@ -10,6 +11,42 @@ class CoinbaseHourlyPartition(CryptoTickHourlyMixin, BaseCoinbase):
 
 
 class CoinbaseDailyPartition(CryptoTickDailyMixin, BaseCoinbase):
+    def main(self):
+        if self.shards:
+            self.main_sharded()
+        else:
+            super().main()
+
+    def main_sharded(self):
+        clear_firestore_caches()
+        self.preload()
+        try:
+            for partition in self.iter_partition():
+                document = self.get_document_name(partition)
+                if not self.firestore_cache.has_data(document):
+                    timestamp_from, timestamp_to = self.get_timestamp_from_to(partition)
+                    trades, start, stop, last_trade_id = self.get_sharded_trades(
+                        timestamp_from, timestamp_to
+                    )
+                    # Is there a trade after the partition?
+                    is_complete = stop <= last_trade_id
+                    if len(trades):
+                        self.write(trades, is_complete=is_complete)
+                    # Maybe iteration complete
+                    elif start == 1:
+                        if self.verbose:
+                            print(f"{self.log_prefix}: Maybe complete")
+                        break
+                    # No trades
+                    elif is_complete:
+                        self.set_firebase({}, is_complete=True)
+                elif self.verbose:
+                    print(f"{self.log_prefix}: {document} OK")
+                # Partition boundary
+                flush_firestore()
+        finally:
+            flush_firestore()
+
     def assert_data_frame(self, data_frame, trades):
         # Duplicates.
         assert len(data_frame["uid"].unique()) == len(trades)
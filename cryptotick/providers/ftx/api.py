@@ -1,7 +1,7 @@
-import httpx
 from ciso8601 import parse_datetime
 
-from .constants import BTC, MAX_RESULTS, URL
+from ...ratelimiter import get_rate_limiter, rate_limited_get
+from .constants import BTC, FTX, MAX_REQUESTS_PER_SECOND, MAX_RESULTS, URL
 
 
 def parse_timestamp(timestamp):
@@ -20,7 +20,8 @@ def get_expired_futures(root_symbol=BTC, verbose=True):
 
 
 def get_futures(url, root_symbol=BTC, verbose=True):
-    response = httpx.get(url)
+    rate_limiter = get_rate_limiter(FTX, MAX_REQUESTS_PER_SECOND)
+    response = rate_limited_get(rate_limiter, url)
     data = response.json()
     result = data["result"]
     success = data["success"]
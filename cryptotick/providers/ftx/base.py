@@ -1,8 +1,13 @@
+import asyncio
 import datetime
 
+import numpy as np
+from ciso8601 import parse_datetime
 from yapic import json
 
 from ...cryptotick import CryptoTickREST
+from ...fscache import clear_firestore_caches, flush_firestore
+from ...httpclient import get_async_client, run_async
 from .constants import FTX, MAX_REQUESTS_PER_SECOND, MAX_RESULTS, URL
 
 
@@ -13,6 +18,7 @@ class BaseFTX(CryptoTickREST):
         period_from=None,
         period_to=None,
         aggregate=False,
+        shards=0,
         verbose=False,
     ):
         super().__init__(
@@ -24,14 +30,14 @@ class BaseFTX(CryptoTickREST):
             verbose=verbose,
         )
         self.api_symbol = api_symbol
+        self.shards = shards
         self.uids = []
         self.last_timestamp = None
 
-    @property
-    def url(self):
+    def get_url(self, pagination_id):
         url = f"{URL}/markets/{self.api_symbol}/trades?limit={MAX_RESULTS}"
-        if self.pagination_id:
-            url += f"&end_time={self.pagination_id}"
+        if pagination_id:
+            url += f"&end_time={pagination_id}"
         return url
 
     @property
@@ -57,40 +63,121 @@ class BaseFTX(CryptoTickREST):
                 ).timestamp()
 
     def parse_response(self, response):
-        data = json.loads(response.content)
+        data = json.loads(response.content, parse_date=False)
         if data["success"]:
             trades = self.parse_data(data["result"])
             if len(trades):
                 return self.update_trades(trades)
 
-    def get_uid(self, trade):
-        return str(trade["id"])
-
-    def get_timestamp(self, trade):
-        return trade["time"]
-
-    def get_nanoseconds(self, trade):
-        return 0
-
-    def get_price(self, trade):
-        return float(trade["price"])
-
-    def get_volume(self, trade):
-        return float(trade["price"]) * float(trade["size"])
-
-    def get_notional(self, trade):
-        return float(trade["size"])
-
-    def get_tick_rule(self, trade):
-        return 1 if trade["side"] == "buy" else -1
+    def main(self):
+        if self.shards:
+            self.main_sharded()
+        else:
+            super().main()
+
+    def main_sharded(self):
+        clear_firestore_caches()
+        self.preload()
+        try:
+            for partition in self.iter_partition():
+                document = self.get_document_name(partition)
+                if not self.firestore_cache.has_data(document):
+                    timestamp_from, timestamp_to = self.get_timestamp_from_to(partition)
+                    trades = self.get_sharded_trades(timestamp_from, timestamp_to)
+                    if len(trades):
+                        self.write(trades)
+                    # Maybe iteration complete
+                    else:
+                        self.set_firebase({}, is_complete=True)
+                        if self.verbose:
+                            print(f"{self.log_prefix}: Maybe complete")
+                        break
+                elif self.verbose:
+                    print(f"{self.log_prefix}: {document} OK")
+                # Partition boundary
+                flush_firestore()
+        finally:
+            flush_firestore()
+
+    def get_sharded_trades(self, timestamp_from, timestamp_to):
+        return run_async(self.get_sharded_trades_async(timestamp_from, timestamp_to))
+
+    async def get_sharded_trades_async(self, timestamp_from, timestamp_to):
+        """
+        Partition is split into time windows, which are requested concurrently,
+        then stitched together in reverse order.
+        """
+        delta = (timestamp_to - timestamp_from) / self.shards
+        windows = [
+            (timestamp_to - delta * (index + 1), timestamp_to - delta * index)
+            for index in range(self.shards)
+        ]
+        client = get_async_client(URL)
+        results = await asyncio.gather(
+            *[self.get_window(client, start, stop) for start, stop in windows]
+        )
+        trades = self.get_trade_buffer()
+        for result in results:
+            trades.extend(result)
+        return trades
+
+    async def get_window(self, client, timestamp_from, timestamp_to):
+        start_time = timestamp_from.timestamp()
+        end_time = timestamp_to.timestamp()
+        data = {}
+        while True:
+            url = self.get_url(end_time) + f"&start_time={start_time}"
+            result = await self.get_page(client, url)
+            # End time is inclusive, so trades at the same time may be duplicates.
+            trades = [trade for trade in result if trade["id"] not in data]
+            for trade in trades:
+                data[trade["id"]] = trade
+            if len(result) < MAX_RESULTS:
+                break
+            elif len(trades):
+                end_time = parse_datetime(trades[-1]["time"]).timestamp()
+            # Were there more than MAX_RESULTS with same timestamp?
+            else:
+                end_time = round(end_time - 1e-6, 6)
+        # Sorted by timestamp, then id, as bisect requires trades in time order.
+        keys = sorted(
+            data,
+            key=lambda key: (parse_datetime(data[key]["time"]), key),
+            reverse=True,
+        )
+        trades = self.parse_data([data[key] for key in keys])
+        # Trades at the end of the window belong to the next window.
+        return trades[trades.bisect(timestamp_to) : trades.bisect(timestamp_from)]
+
+    async def get_page(self, client, url):
+        response = await self.get_async_response(client, url)
+        if response.status_code == 200:
+            data = json.loads(response.content, parse_date=False)
+            if data["success"]:
+                return data["result"]
+        raise Exception(f"{response.status_code}: {response.content}")
 
-    def get_index(self, trade):
-        return int(trade["id"])
+    @property
+    def column_mapping(self):
+        return {
+            "uid": "id",
+            "timestamp": "time",
+            "price": "price",
+            "notional": "size",
+            "tickRule": "side",
+            "index": "id",
+        }
+
+    def get_volume(self, price, notional):
+        return price * notional
+
+    def get_tick_rule(self, side):
+        return np.where(side == "buy", 1, -1)
 
     def update_trades(self, trades):
         # Are there duplicates?
-        t = [trade for trade in trades if trade["uid"] not in self.uids]
-        uids = [trade["uid"] for trade in trades]
+        uids = list(trades.get_values("uid"))
+        t = trades[np.array([uid not in self.uids for uid in uids], dtype=bool)]
         if len(t):
             last_timestamp = t[-1]["timestamp"]
             # Next pagination_id
@@ -7,6 +7,7 @@ def ftx_perpetual(
     period_from: str = None,
     period_to: str = None,
     aggregate: bool = False,
+    shards: int = 0,
     verbose: bool = False,
 ):
     assert api_symbol
@@ -19,6 +20,7 @@ def ftx_perpetual(
             period_from=timestamp_from,
             period_to=timestamp_to,
             aggregate=aggregate,
+            shards=shards,
             verbose=verbose,
         ).main()
     if date_from and date_to:
@@ -27,5 +29,6 @@ def ftx_perpetual(
             period_from=date_from,
             period_to=date_to,
             aggregate=aggregate,
+            shards=shards,
             verbose=verbose,
         ).main()
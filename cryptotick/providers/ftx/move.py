@@ -1,6 +1,5 @@
 import datetime
 import re
-import time
 
 from yapic import json
 
@@ -88,17 +87,9 @@ class FTXMOVEETL(BaseFTXETL, FuturesETL):
                     self.symbol = symbol["symbol"]
                     self.api_symbol = symbol["api_symbol"]
                     stop_execution = False
+                    # Paced by rate limiter.
                     while not stop_execution:
-                        start_time = time.time()
-                        for i in range(self.max_requests_per_second):
-                            stop_execution = self.get_data()
-                            if stop_execution:
-                                break
-                        if not stop_execution:
-                            elapsed = time.time() - start_time
-                            if elapsed < 1:
-                                diff = 1 - elapsed
-                                time.sleep(diff)
+                        stop_execution = self.get_data()
             if len(self.trades):
                 self.write(self.trades)
 
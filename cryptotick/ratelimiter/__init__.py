@@ -0,0 +1,9 @@
+from .lib import async_rate_limited_get, get_rate_limiter, rate_limited_get
+from .ratelimiter import RateLimiter
+
+__all__ = [
+    "get_rate_limiter",
+    "rate_limited_get",
+    "async_rate_limited_get",
+    "RateLimiter",
+]
@@ -0,0 +1,5 @@
+# After 429, rate is halved, but not below this factor of max rate.
+MIN_RATE_FACTOR = 0.1
+# After success, rate increases by this factor of max rate.
+RECOVERY_FACTOR = 0.05
+MAX_RETRY_AFTER = 60
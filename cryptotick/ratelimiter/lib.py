@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+
+from ..httpclient import get_client
+from .ratelimiter import RateLimiter
+
+RATE_LIMITERS = {}
+LOCK = threading.Lock()
+
+
+def get_rate_limiter(key, rate):
+    """Rate limiters are shared by key, for example exchange."""
+    with LOCK:
+        if key not in RATE_LIMITERS:
+            RATE_LIMITERS[key] = RateLimiter(rate)
+        return RATE_LIMITERS[key]
+
+
+def rate_limited_get(rate_limiter, url, client=None, retry=5):
+    client = client or get_client(url)
+    e = response = None
+    # Retry n times.
+    for i in range(retry):
+        rate_limiter.acquire()
+        try:
+            response = client.get(url)
+        except Exception as exception:
+            e = exception
+            time.sleep(i + 1)
+        else:
+            if not rate_limiter.is_rate_limited(response):
+                return response
+    if response is None:
+        raise e
+    return response
+
+
+async def async_rate_limited_get(rate_limiter, client, url, retry=5):
+    e = response = None
+    # Retry n times.
+    for i in range(retry):
+        await rate_limiter.acquire_async()
+        try:
+            response = await client.get(url)
+        except Exception as exception:
+            e = exception
+            await asyncio.sleep(i + 1)
+        else:
+            if not rate_limiter.is_rate_limited(response):
+                return response
+    if response is None:
+        raise e
+    return response
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+
+from .constants import MAX_RETRY_AFTER, MIN_RATE_FACTOR, RECOVERY_FACTOR
+
+
+class RateLimiter:
+    """Token bucket, with adaptive rate after 429 responses."""
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+        self.blocked_until = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, and return seconds to wait before using it."""
+        with self.lock:
+            now = self.clock()
+            elapsed = now - self.updated
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def is_rate_limited(self, response):
+        with self.lock:
+            if response.status_code == 429:
+                retry_after = get_retry_after(response)
+                self.blocked_until = self.clock() + retry_after
+                # Multiplicative decrease
+                min_rate = self.max_rate * MIN_RATE_FACTOR
+                self.rate = max(min_rate, self.rate / 2)
+                return True
+            # Additive increase
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FACTOR)
+            return False
+
+
+def get_retry_after(response, default=1):
+    value = response.headers.get("Retry-After", None)
+    try:
+        retry_after = float(value)
+    except (TypeError, ValueError):
+        retry_after = default
+    return min(retry_after, MAX_RETRY_AFTER)
@@ -1,3 +1,5 @@
+from .cache import DownloadCache, get_download_cache
+from .constants import COLUMN_TYPES, PYARROW, PYTHON
 from .lib import (
     calculate_index,
     calculate_notional,
@@ -11,6 +13,9 @@ from .lib import (
 from .s3downloader import HistoricalDownloader
 
 __all__ = [
+    "COLUMN_TYPES",
+    "PYARROW",
+    "PYTHON",
     "utc_timestamp",
     "strip_nanoseconds",
     "calculate_notional",
@@ -20,4 +25,6 @@ __all__ = [
     "set_columns",
     "row_to_json",
     "HistoricalDownloader",
+    "DownloadCache",
+    "get_download_cache",
 ]
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from yapic import json
+
+from ..constants import S3_CACHE_DIRECTORY, S3_CACHE_MAX_SIZE
+from ..httpclient import get_client
+from .constants import MAX_CACHE_SIZE
+
+
+def unlink(path):
+    # Python 3.7 has no missing_ok, and other processes may evict.
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def get_download_cache():
+    directory = os.environ.get(S3_CACHE_DIRECTORY, None)
+    if directory:
+        max_size = int(os.environ.get(S3_CACHE_MAX_SIZE, None) or MAX_CACHE_SIZE)
+        return DownloadCache(directory, max_size=max_size)
+
+
+class DownloadCache:
+    """On disk cache of downloads by URL, with LRU eviction."""
+
+    def __init__(self, directory, max_size=MAX_CACHE_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_key(self, url):
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def get_path(self, url, suffix=".gz"):
+        return self.directory / f"{self.get_key(url)}{suffix}"
+
+    def get(self, url):
+        path = self.get_path(url)
+        metadata = self.get_metadata(url)
+        if metadata:
+            if self.is_valid(url, metadata):
+                # Evicted by another process, is a miss.
+                try:
+                    # Recently used
+                    os.utime(path)
+                    return path.read_bytes()
+                except FileNotFoundError:
+                    pass
+            else:
+                self.delete(url)
+
+    def get_metadata(self, url):
+        path = self.get_path(url, suffix=".json")
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            pass
+
+    def is_valid(self, url, metadata):
+        response = get_client(url).head(url)
+        if response.status_code == 200:
+            etag = response.headers.get("ETag", None)
+            if etag:
+                return etag == metadata.get("etag", None)
+            content_length = response.headers.get("Content-Length", None)
+            if content_length:
+                return int(content_length) == metadata["size"]
+        return False
+
+    def set(self, url, content, headers=None):
+        headers = headers or {}
+        metadata = {
+            "url": url,
+            "etag": headers.get("ETag", None),
+            "size": len(content),
+        }
+        # Metadata last, as it validates the content.
+        self.write(self.get_path(url), content)
+        self.write(self.get_path(url, suffix=".json"), json.dumps(metadata).encode())
+        self.evict()
+
+    def write(self, path, data):
+        # Atomic, so there are no partial files.
+        with NamedTemporaryFile(dir=self.directory, delete=False) as temp:
+            temp.write(data)
+        os.replace(temp.name, path)
+
+    def delete(self, url):
+        for suffix in (".gz", ".json"):
+            unlink(self.get_path(url, suffix=suffix))
+
+    def get_files(self):
+        """Paths, and stats, skipping files deleted by other processes."""
+        files = []
+        for path in self.directory.glob("*.gz"):
+            try:
+                files.append((path, path.stat()))
+            except FileNotFoundError:
+                pass
+        return files
+
+    def evict(self):
+        files = sorted(self.get_files(), key=lambda f: f[1].st_mtime)
+        size = sum([stat.st_size for _, stat in files])
+        # Least recently used first
+        for path, stat in files:
+            if size <= self.max_size:
+                break
+            size -= stat.st_size
+            unlink(path)
+            unlink(path.with_suffix(".json"))
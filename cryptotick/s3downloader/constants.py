@@ -0,0 +1,20 @@
+import pyarrow as pa
+
+PYARROW = "pyarrow"
+PYTHON = "python"
+
+# Bytes of csv per record batch, and of gzip per decompression.
+BLOCK_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+MAX_CACHE_SIZE = 10 * 1024**3  # 10 GB
+
+# Explicit types, so pyarrow doesn't infer types.
+COLUMN_TYPES = {
+    "trdMatchID": pa.string(),
+    "symbol": pa.string(),
+    "timestamp": pa.string(),
+    "size": pa.float64(),
+    "tickDirection": pa.string(),
+    "price": pa.float64(),
+}
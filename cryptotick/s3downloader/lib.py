@@ -1,42 +1,36 @@
 from datetime import timezone
 
 import numpy as np
+import pandas as pd
 
 
 def utc_timestamp(data_frame):
     # Because pyarrow.lib.ArrowInvalid: Casting from timestamp[ns]
     # to timestamp[us, tz=UTC] would lose data.
-    data_frame.timestamp = data_frame.apply(
-        lambda x: x.timestamp.tz_localize(timezone.utc), axis=1
-    )
+    data_frame["timestamp"] = data_frame.timestamp.dt.tz_localize(timezone.utc)
     return data_frame
 
 
 def strip_nanoseconds(data_frame):
     # Bitmex data is accurate to the nanosecond.
     # However, data is typically only provided to the microsecond.
-    data_frame["nanoseconds"] = data_frame.apply(
-        lambda x: x.timestamp.nanosecond, axis=1
-    )
-    data_frame.timestamp = data_frame.apply(
-        lambda x: x.timestamp.replace(nanosecond=0)
-        if x.nanoseconds > 0
-        else x.timestamp,
-        axis=1,
+    nanoseconds = data_frame.timestamp.dt.nanosecond.astype("int64")
+    data_frame["nanoseconds"] = nanoseconds
+    data_frame["timestamp"] = data_frame.timestamp - pd.to_timedelta(
+        nanoseconds, unit="ns"
     )
     return data_frame
 
 
 def calculate_notional(data_frame, func):
-    data_frame["notional"] = data_frame.apply(func, axis=1)
+    # Func is calculated with columns, not rows.
+    data_frame["notional"] = func(data_frame)
     return data_frame
 
 
 def calculate_tick_rule(data_frame):
-    data_frame["tickRule"] = data_frame.apply(
-        lambda x: (1 if x.tickDirection in ("PlusTick", "ZeroPlusTick") else -1),
-        axis=1,
-    )
+    is_plus_tick = data_frame.tickDirection.isin(("PlusTick", "ZeroPlusTick"))
+    data_frame["tickRule"] = np.where(is_plus_tick, 1, -1)
     return data_frame
 
 
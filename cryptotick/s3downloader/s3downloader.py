@@ -1,9 +1,18 @@
 import gzip
+import io
 import os
+import zlib
 from tempfile import NamedTemporaryFile
 
-import httpx
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv
+
+from ..httpclient import get_client
+from .cache import get_download_cache
+from .constants import BLOCK_SIZE, CHUNK_SIZE, COLUMN_TYPES, PYARROW, PYTHON
 
 
 class HistoricalDownloader:
@@ -11,41 +20,131 @@ class HistoricalDownloader:
         self,
         url,
         columns=("trdMatchID", "symbol", "timestamp", "size", "tickDirection", "price"),
+        column_types=None,
+        symbols=None,
+        block_size=BLOCK_SIZE,
+        engine=PYARROW,
+        cache=None,
     ):
         self.url = url
         self.columns = columns
+        self.column_types = column_types or COLUMN_TYPES
+        self.symbols = symbols
+        self.block_size = block_size
+        self.engine = engine
+        self.cache = cache or get_download_cache()
 
     def main(self):
+        content = self.download()
+        if content is not None:
+            return self.extract(content)
+
+    def download(self):
+        if self.cache:
+            content = self.cache.get(self.url)
+            if content is not None:
+                return content
         # Streaming downloads with boto3, and httpx gave many EOFErrors.
         # No problem with regular download.
-        response = httpx.get(self.url)
+        response = get_client(self.url).get(self.url)
         if response.status_code == 200:
-            temp_file = NamedTemporaryFile()
-            filename = temp_file.name
-            with open(filename, "wb+") as temp:
-                temp.write(response.content)
-                size = os.path.getsize(filename)
-                if size > 0:
-                    # Extract
-                    return self._extract(filename)
-                else:
-                    print(f"No data: {self.url}")
+            if self.cache and len(response.content) > 0:
+                self.cache.set(self.url, response.content, response.headers)
+            return response.content
         else:
             print(f"Error {response.status_code}: {self.url}")
 
-    def _extract(self, filename):
+    def extract(self, content):
+        if len(content) > 0:
+            if self.engine == PYTHON:
+                return self._extract_file(content)
+            # Only requested symbols, batch by batch
+            if self.symbols:
+                return self._extract_batches(content)
+            # Extract
+            return self._extract(content)
+        else:
+            print(f"No data: {self.url}")
+
+    def _extract(self, content):
         try:
-            data_frame = pd.read_csv(
-                filename,
-                usecols=self.columns,
-                engine="python",
-                compression="gzip",
-            )
-        except EOFError:
-            print(f"EOFError: {filename}")
-            data_frame = self._extract_force(filename)
+            stream = pa.input_stream(pa.py_buffer(content), compression="gzip")
+            return self._read_csv(stream)
+        except OSError:
+            print(f"EOFError: {self.url}")
+            return self._read_csv(self._decompress_force(content))
+
+    def _extract_batches(self, content):
+        read_options = csv.ReadOptions(use_threads=True, block_size=self.block_size)
+        reader = csv.open_csv(
+            GzipLineReader(content),
+            read_options=read_options,
+            convert_options=self.convert_options,
+        )
+        index = reader.schema.get_field_index("symbol")
+        symbols = pa.array(self.symbols, type=pa.string())
+        batches = []
+        row_numbers = []
+        offset = 0
+        for batch in reader:
+            is_symbol = pc.is_in(batch.column(index), value_set=symbols)
+            b = batch.filter(is_symbol)
+            if b.num_rows:
+                batches.append(b)
+                # Row numbers of the file, as calculate_index is by row number.
+                is_symbol = is_symbol.to_numpy(zero_copy_only=False)
+                row_numbers.append(np.flatnonzero(is_symbol) + offset)
+            offset += batch.num_rows
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        data_frame = table.to_pandas()
+        if row_numbers:
+            data_frame.index = np.concatenate(row_numbers)
         return data_frame
 
+    @property
+    def convert_options(self):
+        return csv.ConvertOptions(
+            include_columns=list(self.columns),
+            column_types={
+                key: value
+                for key, value in self.column_types.items()
+                if key in self.columns
+            },
+        )
+
+    def _read_csv(self, data):
+        read_options = csv.ReadOptions(use_threads=True)
+        table = csv.read_csv(
+            data, read_options=read_options, convert_options=self.convert_options
+        )
+        return table.to_pandas()
+
+    def _decompress_force(self, content):
+        # Decompress as much as possible, then drop the last partial line.
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        data = decompressor.decompress(content)
+        data = data[: data.rfind(b"\n") + 1]
+        return pa.BufferReader(data)
+
+    def _extract_file(self, content):
+        temp_file = NamedTemporaryFile()
+        filename = temp_file.name
+        with open(filename, "wb+") as temp:
+            temp.write(content)
+            size = os.path.getsize(filename)
+            if size > 0:
+                try:
+                    data_frame = pd.read_csv(
+                        filename,
+                        usecols=self.columns,
+                        engine="python",
+                        compression="gzip",
+                    )
+                except EOFError:
+                    print(f"EOFError: {filename}")
+                    data_frame = self._extract_force(filename)
+                return data_frame
+
     def _extract_force(self, filename):
         lines = []
         try:
@@ -56,3 +155,46 @@ class HistoricalDownloader:
             data = [line.strip().split(",") for line in lines]
             data_frame = pd.DataFrame(data[1:], columns=data[0])
         return data_frame
+
+
+class GzipLineReader(io.RawIOBase):
+    """Decompress gzip by chunk. If truncated, drop the last partial line."""
+
+    def __init__(self, content, chunk_size=CHUNK_SIZE):
+        self.content = memoryview(content)
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        self.buffer = b""
+        self.offset = 0
+        self.tail = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self.offset == len(self.buffer) and self.position < len(self.content):
+            self.buffer = self._decompress()
+            self.offset = 0
+        size = min(len(b), len(self.buffer) - self.offset)
+        b[:size] = self.buffer[self.offset : self.offset + size]
+        self.offset += size
+        return size
+
+    def _decompress(self):
+        chunk = self.content[self.position : self.position + self.chunk_size]
+        self.position += len(chunk)
+        try:
+            data = self.tail + self.decompressor.decompress(chunk)
+        except zlib.error:
+            data = self.tail
+            self.position = len(self.content)
+        # Is the file complete?
+        if self.decompressor.eof:
+            self.position = len(self.content)
+            self.tail = b""
+            return data
+        # Hold the partial line, until the next chunk.
+        index = data.rfind(b"\n") + 1
+        self.tail = data[index:]
+        return data[:index]
@@ -0,0 +1,4 @@
+from .lib import parse_timestamps
+from .tradebuffer import TradeBuffer
+
+__all__ = ["parse_timestamps", "TradeBuffer"]
@@ -0,0 +1,14 @@
+import datetime
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Array typecodes, for columns that are not strings.
+TYPECODES = {
+    "timestamp": "q",  # Nanoseconds since epoch
+    "nanoseconds": "q",
+    "price": "d",
+    "volume": "d",
+    "notional": "d",
+    "tickRule": "q",
+    "index": "q",
+}
@@ -0,0 +1,33 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from ciso8601 import parse_datetime
+
+from .constants import EPOCH
+
+ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def to_nanoseconds(timestamp):
+    # Also pendulum, which can't be subtracted from stdlib datetimes.
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.value
+
+
+def to_datetime(nanoseconds):
+    return EPOCH + datetime.timedelta(microseconds=nanoseconds // 1000)
+
+
+def parse_timestamps(timestamps):
+    """ISO timestamps, to nanoseconds since epoch."""
+    nanoseconds = []
+    for timestamp in timestamps:
+        timestamp = parse_datetime(timestamp)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+        # Integer arithmetic, as float timestamps lose microseconds.
+        nanoseconds.append((timestamp - EPOCH) // ONE_MICROSECOND * 1000)
+    return np.array(nanoseconds, dtype=np.int64)
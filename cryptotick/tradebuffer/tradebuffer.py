@@ -0,0 +1,83 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from .constants import TYPECODES
+from .lib import to_datetime, to_nanoseconds
+
+
+class TradeBuffer:
+    """
+    Append only, with a typed array per column.
+    Trades are in reverse order, so partitions are split by bisection.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.data = {column: self.get_array(column) for column in columns}
+
+    def get_array(self, column):
+        if column in TYPECODES:
+            return array(TYPECODES[column])
+        return []
+
+    def __len__(self):
+        return len(self.data["timestamp"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            trade_buffer = TradeBuffer(self.columns)
+            for column, values in self.data.items():
+                trade_buffer.data[column] = values[index]
+            return trade_buffer
+        elif isinstance(index, np.ndarray):
+            trade_buffer = TradeBuffer(self.columns)
+            trade_buffer.extend_columns(
+                {
+                    column: np.asarray(self.get_values(column), dtype=object)[index]
+                    if column not in TYPECODES
+                    else self.get_values(column)[index]
+                    for column in self.columns
+                }
+            )
+            return trade_buffer
+        trade = {column: values[index] for column, values in self.data.items()}
+        trade["timestamp"] = to_datetime(trade["timestamp"])
+        return trade
+
+    def extend(self, trade_buffer):
+        self.extend_columns(trade_buffer.data)
+
+    def extend_columns(self, data):
+        for column, values in self.data.items():
+            if isinstance(values, array):
+                column_data = np.asarray(data[column], dtype=values.typecode)
+                values.frombytes(column_data.tobytes())
+            else:
+                values.extend(data[column])
+
+    @property
+    def timestamps(self):
+        return self.get_values("timestamp")
+
+    def get_values(self, column):
+        values = self.data[column]
+        if isinstance(values, array):
+            return np.frombuffer(values, dtype=values.typecode)
+        return values
+
+    def bisect(self, timestamp):
+        """Index of the first trade before timestamp."""
+        # Negated, as searchsorted requires ascending order.
+        return int(
+            np.searchsorted(-self.timestamps, -to_nanoseconds(timestamp), side="right")
+        )
+
+    def to_data_frame(self):
+        """Typed columns, to a data frame."""
+        data = {column: self.get_values(column) for column in self.columns}
+        data["timestamp"] = pd.Series(
+            data["timestamp"].view("datetime64[ns]"), copy=False
+        ).dt.tz_localize("UTC")
+        return pd.DataFrame(data, columns=self.columns, copy=False)
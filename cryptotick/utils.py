@@ -1,5 +1,6 @@
 import base64
 import datetime
+import hashlib
 import os
 from pathlib import Path
 
@@ -187,6 +188,15 @@ def date_range(date_from=None, date_to=None, reverse=False):
         yield date
 
 
+def get_fingerprint(data_frame):
+    """Hash of data frame, stable for identical data."""
+    if "uid" in data_frame.columns:
+        data_frame = data_frame.sort_values("uid")
+    columns = sorted(data_frame.columns)
+    hashes = pd.util.hash_pandas_object(data_frame[columns], index=False)
+    return hashlib.sha256(hashes.to_numpy().tobytes()).hexdigest()
+
+
 def publish(topic, data):
     publisher = pubsub_v1.PublisherClient()
     topic = publisher.topic_path(os.environ[PROJECT_ID], topic)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+# isort:skip_file
+import time
+from datetime import timezone
+
+import numpy as np
+import pandas as pd
+import typer
+
+import pathfix  # noqa: F401
+from cryptotick.providers.bitmex.lib import calc_notional
+from cryptotick.s3downloader import (
+    calculate_notional,
+    calculate_tick_rule,
+    strip_nanoseconds,
+    utc_timestamp,
+)
+
+TICK_DIRECTIONS = ("PlusTick", "ZeroPlusTick", "MinusTick", "ZeroMinusTick")
+
+
+def get_data_frame(rows):
+    timestamp = pd.Timestamp("2021-01-01").value
+    timestamps = timestamp + np.sort(np.random.randint(0, 86400 * 10**9, rows))
+    return pd.DataFrame(
+        {
+            "symbol": "XBTUSD",
+            "timestamp": pd.to_datetime(timestamps, unit="ns"),
+            "volume": np.random.randint(1, 10000, rows),
+            "price": np.random.randint(20000, 40000, rows) / 2,
+            "tickDirection": np.random.choice(TICK_DIRECTIONS, rows),
+        }
+    )
+
+
+def row_wise(data_frame):
+    # Previous transforms, with DataFrame.apply
+    data_frame["timestamp"] = data_frame.apply(
+        lambda x: x.timestamp.tz_localize(timezone.utc), axis=1
+    )
+    data_frame["nanoseconds"] = data_frame.apply(
+        lambda x: x.timestamp.nanosecond, axis=1
+    )
+    data_frame["timestamp"] = data_frame.apply(
+        lambda x: x.timestamp.replace(nanosecond=0)
+        if x.nanoseconds > 0
+        else x.timestamp,
+        axis=1,
+    )
+    data_frame["tickRule"] = data_frame.apply(
+        lambda x: (1 if x.tickDirection in ("PlusTick", "ZeroPlusTick") else -1),
+        axis=1,
+    )
+    data_frame["notional"] = data_frame.apply(lambda x: x.volume / x.price, axis=1)
+    return data_frame
+
+
+def column_wise(data_frame):
+    data_frame = utc_timestamp(data_frame)
+    data_frame = strip_nanoseconds(data_frame)
+    data_frame = calculate_tick_rule(data_frame)
+    data_frame = calculate_notional(data_frame, calc_notional)
+    return data_frame
+
+
+def s3downloader_benchmark(rows: int = 100000):
+    data_frame = get_data_frame(rows)
+    results = {}
+    for func in (row_wise, column_wise):
+        start_time = time.time()
+        results[func.__name__] = func(data_frame.copy())
+        elapsed = time.time() - start_time
+        print(f"{func.__name__}: {rows} rows in {elapsed:.3f}s")
+    columns = ["timestamp", "nanoseconds", "tickRule", "notional"]
+    pd.testing.assert_frame_equal(
+        results["row_wise"][columns],
+        results["column_wise"][columns],
+        check_dtype=False,
+    )
+
+
+if __name__ == "__main__":
+    typer.run(s3downloader_benchmark)
@@ -1,8 +1,18 @@
 import datetime
 import random
+from unittest.mock import MagicMock
 
 import pandas as pd
-from cryptotick.aggregators.trades.lib import aggregate_trades
+import pendulum
+import pyarrow as pa
+from cryptotick.aggregators.trades.aggregator import HourlyTradeAggregator
+from cryptotick.aggregators.trades.lib import (
+    aggregate_trades,
+    aggregate_trades_by_row,
+)
+from cryptotick.bqloader import SINGLE_SYMBOL_AGGREGATE_SCHEMA
+from cryptotick.cryptotick import CryptoTick
+from cryptotick.utils import get_fingerprint
 
 from .utils import get_data_frame, get_trade
 
@@ -92,3 +102,128 @@ def test_slippage():
     data_frame = pd.DataFrame(trades)
     df = aggregate_trades(data_frame)
     assert df.loc[0].slippage == 10
+
+
+def test_aggregate_trades_equals_aggregate_trades_by_row():
+    trades = []
+    for symbol in ("A", "B"):
+        for index in range(25):
+            ticks = [random.choice((1, -1)) for i in range(random.randint(1, 12))]
+            trade = {
+                "symbol": symbol,
+                "ticks": ticks,
+                "is_equal_timestamp": random.random() > 0.25,
+            }
+            trades.append(trade)
+    data_frame, _ = get_data_frame(trades)
+    for has_multiple_symbols in (True, False):
+        df = aggregate_trades(data_frame, has_multiple_symbols=has_multiple_symbols)
+        expected = aggregate_trades_by_row(
+            data_frame, has_multiple_symbols=has_multiple_symbols
+        )
+        pd.testing.assert_frame_equal(df, expected, check_exact=True)
+
+
+def test_batched_partitions(monkeypatch):
+    for attr in ("get_period_from", "get_period_to"):
+        monkeypatch.setattr(HourlyTradeAggregator, attr, lambda self, value: value)
+    aggregator = HourlyTradeAggregator("source.table", batch_size=2)
+    partitions = [
+        pendulum.datetime(2021, 1, 1, 3),
+        pendulum.datetime(2021, 1, 1, 2),
+        pendulum.datetime(2021, 1, 1, 1),
+        pendulum.datetime(2021, 1, 1, 0),
+        pendulum.datetime(2020, 12, 31, 21),
+    ]
+    batches = aggregator.get_batches(partitions)
+    assert batches == [partitions[:2], partitions[2:4], partitions[4:]]
+    timestamps = pd.date_range("2021-01-01", periods=6, freq="20min", tz="UTC")
+    data_frame = pd.DataFrame({"timestamp": timestamps})
+    aggregator.read_data_frame = lambda timestamp_from, timestamp_to: data_frame
+    lengths = {}
+    aggregator.process_partition = lambda df: lengths.update(
+        {aggregator.partition: len(df)}
+    )
+    aggregator.process_batch(batches[1])
+    assert lengths == {partitions[2]: 3, partitions[3]: 3}
+
+
+def test_write_aggregated():
+    crypto_tick = CryptoTick("exchange", "symbol", aggregate=True)
+    crypto_tick.partition_decorator = "20210101"
+    bigquery_loader = MagicMock()
+    crypto_tick.get_bigquery_loader = MagicMock(return_value=bigquery_loader)
+    crypto_tick.set_firebase = MagicMock()
+    timestamp = pd.Timestamp("2021-01-01", tz="UTC")
+    data_frame = pd.DataFrame(
+        {
+            "uid": ["3", "2", "1"],
+            "timestamp": [timestamp + pd.Timedelta("1s"), timestamp, timestamp],
+            "nanoseconds": [0, 0, 0],
+            "price": [2.0, 1.0, 1.0],
+            "volume": [2.0, 1.0, 1.0],
+            "notional": [1.0, 1.0, 1.0],
+            "tickRule": [1, 1, 1],
+            "index": [3, 2, 1],
+        }
+    )
+    crypto_tick.write_aggregated("dataset.table", data_frame)
+    crypto_tick.get_bigquery_loader.assert_called_once_with(
+        "dataset.table_aggregated", "20210101"
+    )
+    schema, df = bigquery_loader.write_table.call_args[0]
+    assert schema == SINGLE_SYMBOL_AGGREGATE_SCHEMA
+    assert df.ticks.tolist() == [2, 1]
+    assert df.price.tolist() == [1.0, 2.0]
+
+
+def test_unchanged_partition_is_not_written(monkeypatch):
+    for attr in ("get_period_from", "get_period_to"):
+        monkeypatch.setattr(HourlyTradeAggregator, attr, lambda self, value: value)
+    documents = {}
+    firestore_destination = MagicMock(
+        get=documents.get,
+        set_async=lambda document, data, **kwargs: documents.update({document: data}),
+    )
+    monkeypatch.setattr(
+        HourlyTradeAggregator, "firestore_destination", firestore_destination
+    )
+    aggregator = HourlyTradeAggregator("source.table", force=True)
+    aggregator.get_bigquery_loader = MagicMock()
+    aggregator.set_partition(pendulum.datetime(2021, 1, 1))
+    data_frame, _ = get_data_frame([{"ticks": [1, -1, 1]}])
+    df = aggregator.process_data_frame(data_frame)
+    aggregator.write(df)
+    assert documents["2021-01-01T00"]["fingerprint"] == get_fingerprint(df)
+    # Re-run, with identical data
+    aggregator.write(aggregator.process_data_frame(data_frame))
+    assert aggregator.get_bigquery_loader.call_count == 1
+    # Trades are sorted by uid
+    data_frame["uid"] = ["1", "2", "3"]
+    assert get_fingerprint(data_frame) == get_fingerprint(data_frame.iloc[::-1])
+
+
+def test_read_data_frame(monkeypatch):
+    for attr in ("get_period_from", "get_period_to"):
+        monkeypatch.setattr(HourlyTradeAggregator, attr, lambda self, value: value)
+    aggregator = HourlyTradeAggregator("source.table")
+    aggregator.set_partition(pendulum.datetime(2021, 1, 1))
+    timestamp = pd.Timestamp("2021-01-01", tz="UTC")
+    # Streams are unordered
+    table = pa.table(
+        {
+            "timestamp": [timestamp + pd.Timedelta("1s"), timestamp, timestamp],
+            "nanoseconds": [0, 0, 0],
+            "price": [3.0, 2.0, 1.0],
+            "volume": [1.0, 1.0, 1.0],
+            "notional": [1.0, 1.0, 1.0],
+            "tickRule": [1, 1, 1],
+            "index": [3, 2, 1],
+        }
+    )
+    bigquery_loader = MagicMock(read_arrow=MagicMock(return_value=table))
+    aggregator.get_bigquery_loader = MagicMock(return_value=bigquery_loader)
+    data_frame = aggregator.get_data_frame()
+    assert data_frame.price.tolist() == [1.0, 2.0, 3.0]
+    assert data_frame.index.tolist() == [0, 1, 2]
+    assert "index" not in data_frame.columns
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from cryptotick.bqloader import (
+    BigQueryDaily,
+    base,
+    get_bigquery_client,
+    lib,
+    uncache_tables,
+)
+from cryptotick.bqloader.storage import iter_record_batches
+from google.auth.exceptions import TransportError
+from google.cloud import bigquery
+
+
+@pytest.fixture
+def project(monkeypatch, request):
+    """Project of the test, as clients and tables are cached by project."""
+    project = request.node.name.replace("_", "-")
+    monkeypatch.setenv("PROJECT_ID", project)
+    monkeypatch.delenv("BIGQUERY_LOCATION", raising=False)
+    monkeypatch.setattr(lib.google.auth, "default", Mock(return_value=(None, None)))
+    monkeypatch.setattr(
+        lib.bigquery, "Client", Mock(side_effect=lambda **kwargs: Mock())
+    )
+    return project
+
+
+def test_bigquery_client(project):
+    bigquery_client = get_bigquery_client(project)
+    assert get_bigquery_client(project) is bigquery_client
+    assert get_bigquery_client(project, location="US") is not bigquery_client
+    for date in ("20210101", "20210102"):
+        bigquery_loader = BigQueryDaily("dataset.table", date)
+        assert bigquery_loader.bq is bigquery_client
+    assert lib.google.auth.default.call_count == 2
+
+
+def test_bigquery_tables_cache(project):
+    bigquery_client = get_bigquery_client(project)
+    bigquery_client.list_tables.return_value = [Mock(table_id="table")]
+    bigquery_loader = BigQueryDaily("dataset.table", "20210101")
+    assert bigquery_loader.table_exists()
+    assert not BigQueryDaily("dataset.other", "20210101").table_exists()
+    assert bigquery_client.list_tables.call_count == 1
+    # Created
+    bigquery_loader = BigQueryDaily("dataset.other", "20210101")
+    bigquery_loader.create_table([])
+    assert bigquery_loader.table_exists()
+    assert bigquery_loader.get_schema() == []
+    # Deleted
+    bigquery_loader.delete_table()
+    assert not bigquery_loader.table_exists()
+    assert bigquery_client.list_tables.call_count == 1
+    bigquery_client.query.assert_not_called()
+
+
+def test_bigquery_schema_cache(project):
+    bigquery_client = get_bigquery_client(project)
+    bigquery_client.project = project
+    bigquery_client.list_tables.return_value = [Mock(table_id="table")]
+    schema = [bigquery.SchemaField("price", "FLOAT", "REQUIRED")]
+    bigquery_client.get_table.return_value = Mock(schema=schema)
+    for date in ("20210101", "20210102"):
+        assert BigQueryDaily("dataset.table", date).get_schema() == schema
+    bigquery_client.get_table.assert_called_once_with(f"{project}.dataset.table")
+    # Created by another process
+    bigquery_client.list_tables.return_value.append(Mock(table_id="other"))
+    assert not BigQueryDaily("dataset.other", "20210101").table_exists()
+    uncache_tables(project=project)
+    assert BigQueryDaily("dataset.other", "20210101").table_exists()
+    assert bigquery_client.list_tables.call_count == 2
+
+
+def test_bigquery_storage_record_batches():
+    table = pa.table({"index": list(range(100))})
+    batches = table.to_batches(max_chunksize=10)
+    streams = [SimpleNamespace(name=f"stream-{index}") for index in range(3)]
+    session = SimpleNamespace(
+        streams=streams,
+        arrow_schema=SimpleNamespace(
+            serialized_schema=table.schema.serialize().to_pybytes()
+        ),
+    )
+    responses = {
+        stream.name: [
+            SimpleNamespace(
+                arrow_record_batch=SimpleNamespace(
+                    serialized_record_batch=batch.serialize().to_pybytes()
+                )
+            )
+            for batch in batches[index::3]
+        ]
+        for index, stream in enumerate(streams)
+    }
+    client = Mock(read_rows=lambda name: responses[name])
+    data = pa.Table.from_batches(iter_record_batches(client, session))
+    # Streams are read in parallel, so unordered
+    assert sorted(data["index"].to_pylist()) == list(range(100))
+
+
+def get_write_partitions_client(project):
+    bigquery_client = get_bigquery_client(project)
+    bigquery_client.project = project
+    bigquery_client.list_tables.return_value = [Mock(table_id="table")]
+    bigquery_client.create_table.side_effect = lambda table: SimpleNamespace(
+        project=project,
+        dataset_id="dataset",
+        table_id=table.table_id,
+    )
+    return bigquery_client
+
+
+def write_partitions():
+    data_frames = {
+        "20210102": pd.DataFrame({"price": [2.0], "other": [0]}),
+        "20210101": pd.DataFrame({"price": [1.0], "other": [0]}),
+    }
+    schema = [bigquery.SchemaField("price", "FLOAT", "REQUIRED")]
+    BigQueryDaily("dataset.table", None).write_partitions(schema, data_frames)
+
+
+def test_bigquery_write_partitions(project):
+    bigquery_client = get_write_partitions_client(project)
+    write_partitions()
+    # One load job, for all partitions
+    data_frame, staging_table = bigquery_client.load_table_from_dataframe.call_args[0]
+    assert data_frame.price.tolist() == [2.0, 1.0]
+    assert staging_table.table_id.startswith("table_staging_")
+    sql = bigquery_client.query.call_args[0][0]
+    assert f"DELETE FROM `{project}.dataset.table`" in sql
+    assert "@timestamp_to_1" in sql
+    bigquery_client.delete_table.assert_called_once()
+
+
+def test_bigquery_write_partitions_retry(project, monkeypatch):
+    monkeypatch.setattr(base.time, "sleep", Mock())
+    bigquery_client = get_write_partitions_client(project)
+    bigquery_client.query.side_effect = [TransportError(), Mock()]
+    write_partitions()
+    # Staging table deleted, on retry
+    assert bigquery_client.load_table_from_dataframe.call_count == 2
+    assert bigquery_client.delete_table.call_count == 2
+
+
+def test_bigquery_write_partitions_failure(project, monkeypatch):
+    monkeypatch.setattr(base.time, "sleep", Mock())
+    bigquery_client = get_write_partitions_client(project)
+    bigquery_client.load_table_from_dataframe.side_effect = TransportError()
+    with pytest.raises(TransportError):
+        write_partitions()
+    assert bigquery_client.delete_table.call_count == 5
+    bigquery_client.query.assert_not_called()
@@ -0,0 +1,183 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pendulum
+from cryptotick.providers.bitmex import multi_symbol
+from cryptotick.providers.bitmex.futures import BitmexFuturesDailyPartition
+from cryptotick.providers.bitmex.multi_symbol import BitmexMultiSymbolDailyS3
+from cryptotick.providers.bitmex.perpetual import BitmexPerpetualDailyPartition
+
+PERIOD_FROM = pendulum.date(2021, 1, 1)
+PERIOD_TO = pendulum.date(2021, 1, 3)
+SYMBOLS = ["XBTUSD", "XBTH21", "ETHUSD", "XBTUSD", "XBTM21", "XBTH21"]
+FUTURES = [
+    {
+        "symbol": "XBTH21",
+        "listing": datetime.datetime(2020, 12, 1),
+        "expiry": datetime.datetime(2021, 1, 2),
+    },
+    {
+        "symbol": "XBTM21",
+        "listing": datetime.datetime(2021, 1, 2),
+        "expiry": datetime.datetime(2021, 3, 1),
+    },
+]
+FIRESTORE_CACHES = {}
+
+
+def get_partition(monkeypatch, cls, symbol, **kwargs):
+    monkeypatch.setenv("BIGQUERY_DATASET", "dataset")
+    documents = {}
+    firestore_cache = MagicMock(
+        collection=f"bitmex-{symbol}",
+        get=documents.get,
+        has_data=lambda document: document in documents,
+        set_async=lambda document, data, **kwargs: documents.update({document: data}),
+    )
+    p = cls(symbol, period_from=PERIOD_FROM, period_to=PERIOD_TO, **kwargs)
+    # By symbol, as partitions may have the same class.
+    FIRESTORE_CACHES[symbol] = firestore_cache
+    for attr in ("firestore_cache", "firestore_aggregated"):
+        monkeypatch.setattr(
+            cls, attr, property(lambda self: FIRESTORE_CACHES[self.symbol])
+        )
+    return p
+
+
+def get_multi_symbol(monkeypatch, data_frames, **kwargs):
+    """Partitions, and downloads of the multi symbol provider."""
+    downloads = []
+
+    class HistoricalDownloader:
+        def __init__(self, url, column_types=None, symbols=None):
+            self.date = url.split("/")[-1][:8]
+            downloads.append((self.date, symbols))
+            self.symbols = symbols
+
+        def main(self):
+            data_frame = data_frames.get(self.date)
+            if data_frame is not None:
+                return data_frame[data_frame.symbol.isin(self.symbols)]
+
+    monkeypatch.setattr(multi_symbol, "HistoricalDownloader", HistoricalDownloader)
+    monkeypatch.setattr(
+        BitmexFuturesDailyPartition, "get_symbols", lambda self: FUTURES
+    )
+    partitions = [
+        get_partition(monkeypatch, BitmexPerpetualDailyPartition, s, **kwargs)
+        for s in ("XBTUSD", "ETHUSD")
+    ]
+    partitions.append(
+        get_partition(monkeypatch, BitmexFuturesDailyPartition, "XBT", **kwargs)
+    )
+    return partitions, downloads
+
+
+def get_data_frames(symbols=SYMBOLS):
+    return {
+        date.strftime("%Y%m%d"): pd.DataFrame({"symbol": symbols})
+        for date in pendulum.period(PERIOD_FROM, PERIOD_TO).range("days")
+    }
+
+
+def process(partitions):
+    """Symbols, and file rows, of each processed partition."""
+    processed = {}
+    for p in partitions:
+
+        def process_dataframe(data_frame, p=p):
+            key = (p.symbol, p.partition.day)
+            processed[key] = (list(data_frame.symbol), list(data_frame.index))
+
+        p.process_dataframe = process_dataframe
+    return processed
+
+
+def test_multi_symbol(monkeypatch):
+    partitions, downloads = get_multi_symbol(monkeypatch, get_data_frames())
+    processed = process(partitions)
+    BitmexMultiSymbolDailyS3(
+        partitions, period_from=PERIOD_FROM, period_to=PERIOD_TO
+    ).main()
+    # Each date is downloaded once, for the symbols of all partitions.
+    assert downloads == [
+        ("20210103", ["ETHUSD", "XBTM21", "XBTUSD"]),
+        ("20210102", ["ETHUSD", "XBTH21", "XBTM21", "XBTUSD"]),
+        ("20210101", ["ETHUSD", "XBTH21", "XBTUSD"]),
+    ]
+    # Once per symbol, with rows in order of the file
+    assert len(processed) == 9
+    for day in (1, 2, 3):
+        assert processed[("XBTUSD", day)] == (["XBTUSD", "XBTUSD"], [0, 3])
+        assert processed[("ETHUSD", day)] == (["ETHUSD"], [2])
+    # Active futures, by date
+    assert processed[("XBT", 3)] == (["XBTM21"], [4])
+    assert processed[("XBT", 2)] == (["XBTH21", "XBTM21", "XBTH21"], [1, 4, 5])
+    assert processed[("XBT", 1)] == (["XBTH21", "XBTH21"], [1, 5])
+
+
+def test_multi_symbol_maybe_complete(monkeypatch, capsys):
+    data_frames = get_data_frames()
+    # No ETHUSD before the 3rd
+    for date in ("20210102", "20210101"):
+        data_frame = data_frames[date]
+        data_frames[date] = data_frame[data_frame.symbol != "ETHUSD"]
+    partitions, downloads = get_multi_symbol(monkeypatch, data_frames, verbose=True)
+    processed = process(partitions)
+    BitmexMultiSymbolDailyS3(
+        partitions, period_from=PERIOD_FROM, period_to=PERIOD_TO
+    ).main()
+    assert [key for key in processed if key[0] == "ETHUSD"] == [("ETHUSD", 3)]
+    # Not downloaded, after maybe complete
+    assert downloads[-1] == ("20210101", ["XBTH21", "XBTUSD"])
+    assert "ETHUSD: Maybe complete" in capsys.readouterr().out
+
+
+def test_multi_symbol_no_file(monkeypatch):
+    data_frames = get_data_frames()
+    del data_frames["20210102"]
+    partitions, downloads = get_multi_symbol(monkeypatch, data_frames)
+    processed = process(partitions)
+    BitmexMultiSymbolDailyS3(
+        partitions, period_from=PERIOD_FROM, period_to=PERIOD_TO
+    ).main()
+    assert [date for date, _ in downloads] == ["20210103", "20210102"]
+    assert {day for _, day in processed} == {3}
+
+
+def test_multi_symbol_batch(monkeypatch):
+    partitions, downloads = get_multi_symbol(monkeypatch, get_data_frames(), batch=True)
+    bigquery_loader = MagicMock()
+    for p in partitions:
+        p.get_bigquery_loader = MagicMock(return_value=bigquery_loader)
+        p.write_batch = MagicMock(wraps=p.write_batch)
+
+        def parse_dataframe(data_frame, p=p):
+            timestamp = pd.Timestamp(p.partition.isoformat(), tz="UTC")
+            return data_frame.assign(
+                uid=data_frame.index.astype(str),
+                timestamp=timestamp,
+                nanoseconds=0,
+                price=1.0,
+                volume=1.0,
+                notional=1.0,
+                tickRule=1,
+                index=data_frame.index,
+            )
+
+        p.parse_dataframe = parse_dataframe
+    # Futures Firebase data, is by symbol
+    partitions[2].get_firebase_data = lambda data_frame: {}
+    BitmexMultiSymbolDailyS3(
+        partitions, period_from=PERIOD_FROM, period_to=PERIOD_TO
+    ).main()
+    # One load job per partition, for all dates
+    assert bigquery_loader.write_partitions.call_count == 3
+    for args in bigquery_loader.write_partitions.call_args_list:
+        assert list(args[0][1]) == ["20210103", "20210102", "20210101"]
+    for p in partitions:
+        assert p.write_batch.call_count == 3
+        assert not p.batch_data_frames
+        # Firebase, once loaded
+        assert p.firestore_cache.has_data("2021-01-01")
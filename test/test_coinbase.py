@@ -0,0 +1,117 @@
+import datetime
+import re
+
+from cryptotick import cryptotick
+from cryptotick.httpclient import run_async
+from cryptotick.providers.coinbase import base
+from cryptotick.providers.coinbase.spot import CoinbaseDailyPartition
+
+from .utils import FakeClient, FakeRateLimiter
+
+TIMESTAMP = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+LAST_TRADE_ID = 5000
+MISSING = {1234, 1440, 1441, 2500, 2879}
+
+
+def get_timestamp(trade_id):
+    # One trade per minute
+    return TIMESTAMP + datetime.timedelta(minutes=trade_id)
+
+
+def handler(url):
+    # After gets data older than pagination id.
+    match = re.search(r"after=(\d+)", url)
+    after = int(match.group(1)) if match else LAST_TRADE_ID + 1
+    trade_ids = [i for i in range(after - 1, 0, -1) if i not in MISSING][:100]
+    data = [
+        {
+            "trade_id": trade_id,
+            "time": get_timestamp(trade_id).isoformat().replace("+00:00", "Z"),
+            "price": "1",
+            "size": "1",
+            "side": "buy",
+        }
+        for trade_id in trade_ids
+    ]
+    return data, {"cb-after": str(trade_ids[-1])} if trade_ids else {}
+
+
+def get_coinbase(monkeypatch, client):
+    for module in (base, cryptotick):
+        monkeypatch.setattr(module, "get_async_client", lambda url: client)
+    monkeypatch.setattr(CoinbaseDailyPartition, "rate_limiter", FakeRateLimiter())
+    return CoinbaseDailyPartition("BTC-USD", shards=4)
+
+
+def test_sharded_trades(monkeypatch):
+    client = FakeClient(handler)
+    coinbase = get_coinbase(monkeypatch, client)
+    timestamp_from = TIMESTAMP + datetime.timedelta(days=1)
+    timestamp_to = timestamp_from + datetime.timedelta(days=1)
+    trades, start, stop, last_trade_id = coinbase.get_sharded_trades(
+        timestamp_from, timestamp_to
+    )
+    # Missing trade ids at boundaries
+    assert (start, stop, last_trade_id) == (1442, 2880, LAST_TRADE_ID)
+    # Is there a trade after the partition?
+    assert stop <= last_trade_id
+    # Overlapping pages, are merged
+    expected = [i for i in range(2879, 1441, -1) if i not in MISSING]
+    assert [trade["index"] for trade in trades] == expected
+
+
+def test_sharded_trades_reuse_trade_id(monkeypatch):
+    client = FakeClient(handler)
+    coinbase = get_coinbase(monkeypatch, client)
+    timestamp_from = TIMESTAMP + datetime.timedelta(days=1)
+    timestamp_to = timestamp_from + datetime.timedelta(days=1)
+    coinbase.get_sharded_trades(timestamp_from, timestamp_to)
+    requests = len(client.urls)
+    # Previous partition
+    trades, start, stop, _ = coinbase.get_sharded_trades(TIMESTAMP, timestamp_from)
+    assert stop == 1442
+    assert trades[0]["index"] == 1439
+    assert trades[-1]["index"] == 1
+    # Only start is bisected
+    previous_requests = len(client.urls) - requests
+    assert previous_requests < requests
+
+
+def test_sharded_trades_incomplete(monkeypatch):
+    client = FakeClient(handler)
+    coinbase = get_coinbase(monkeypatch, client)
+    timestamp_from = TIMESTAMP + datetime.timedelta(days=3)
+    timestamp_to = timestamp_from + datetime.timedelta(days=1)
+    trades, start, stop, last_trade_id = coinbase.get_sharded_trades(
+        timestamp_from, timestamp_to
+    )
+    # No trade after the partition
+    assert stop == last_trade_id + 1
+    assert not stop <= last_trade_id
+    assert [trade["index"] for trade in trades] == list(range(5000, 4319, -1))
+
+
+def paginate(monkeypatch, is_serial=False):
+    client = FakeClient(handler)
+    coinbase = get_coinbase(monkeypatch, client)
+    if is_serial:
+        coinbase.get_next_pagination_ids = lambda n: [coinbase.pagination_id]
+    coinbase.update = lambda: None
+    coinbase.set_partition((TIMESTAMP + datetime.timedelta(days=1)).date())
+    # Start of the next partition
+    coinbase.pagination_id = 2880
+    run_async(coinbase.paginate())
+    return [trade["index"] for trade in coinbase.trades], client.urls
+
+
+def test_paginate(monkeypatch):
+    trade_ids, urls = paginate(monkeypatch)
+    serial_trade_ids, serial_urls = paginate(monkeypatch, is_serial=True)
+    # Missing trade ids, so a predicted pagination id was discarded
+    assert set(urls) - set(serial_urls)
+    assert trade_ids == serial_trade_ids
+    # Until a trade before the partition
+    assert trade_ids[-1] < 1440
+    assert trade_ids == [
+        i for i in range(2879, trade_ids[-1] - 1, -1) if i not in MISSING
+    ]
@@ -0,0 +1,245 @@
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pendulum
+import pytest
+from cryptotick import cryptotick
+from cryptotick.providers.bitmex.perpetual import BitmexPerpetualDailyPartition
+
+
+def get_bitmex(monkeypatch, documents, period_to=pendulum.date(2021, 1, 3), **kwargs):
+    monkeypatch.setenv("BIGQUERY_DATASET", "dataset")
+    firestore_cache = MagicMock(
+        collection="bitmex-XBTUSD",
+        get=documents.get,
+        has_data=lambda document: document in documents,
+        set_async=lambda document, data, **kwargs: documents.update({document: data}),
+    )
+    for attr in ("firestore_cache", "firestore_aggregated"):
+        monkeypatch.setattr(BitmexPerpetualDailyPartition, attr, firestore_cache)
+    return BitmexPerpetualDailyPartition(
+        "XBTUSD",
+        period_from=pendulum.date(2021, 1, 1),
+        period_to=period_to,
+        **kwargs,
+    )
+
+
+class InlineFuture(Future):
+    """Runs when the result is requested, unless cancelled."""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+
+    def result(self, timeout=None):
+        if not self.done() and (self.running() or self.set_running_or_notify_cancel()):
+            try:
+                self.set_result(self.fn(*self.args))
+            except Exception as exception:
+                self.set_exception(exception)
+        return super().result(timeout)
+
+
+class InlineExecutor:
+    """Instead of ProcessPoolExecutor, with days that are already running."""
+
+    def __init__(self, running=(), **kwargs):
+        self.running = running
+        self.futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def submit(self, fn, *args):
+        future = InlineFuture(fn, *args)
+        if args[-1].day in self.running:
+            future.set_running_or_notify_cancel()
+        self.futures.append(future)
+        return future
+
+
+def get_data_frame(partition):
+    return pd.DataFrame(
+        {
+            "uid": ["1"],
+            "symbol": ["XBTUSD"],
+            "timestamp": [pd.Timestamp(partition.isoformat(), tz="UTC")],
+            "nanoseconds": [0],
+            "price": [1.0],
+            "volume": [1.0],
+            "notional": [1.0],
+            "tickRule": [1],
+            "index": [0],
+        }
+    )
+
+
+def test_batch(monkeypatch):
+    documents = {}
+    bitmex = get_bitmex(monkeypatch, documents, batch=True, aggregate=True)
+    bigquery_loader = MagicMock()
+    bitmex.get_bigquery_loader = MagicMock(return_value=bigquery_loader)
+    for partition in bitmex.iter_partition():
+        bitmex.write(get_data_frame(partition))
+    assert bitmex.batch_rows == 3
+    assert not documents
+    bitmex.flush_batch()
+    # One load job for trades, and one for aggregated trades.
+    assert bigquery_loader.write_partitions.call_count == 2
+    table_ids = [args[0][0] for args in bitmex.get_bigquery_loader.call_args_list]
+    assert table_ids == [
+        "dataset.bitmex_XBTUSD_test",
+        "dataset.bitmex_XBTUSD_test_aggregated",
+    ]
+    for args in bigquery_loader.write_partitions.call_args_list:
+        assert list(args[0][1]) == ["20210103", "20210102", "20210101"]
+    assert len(documents) == 3
+    assert bitmex.batch_rows == 0
+    assert bitmex.partition == pendulum.date(2021, 1, 1)
+
+
+def main_parallel(monkeypatch, run_partition, documents=None, running=()):
+    bitmex = get_bitmex(
+        monkeypatch,
+        documents or {},
+        period_to=pendulum.date(2021, 1, 10),
+        workers=2,
+        verbose=True,
+    )
+    monkeypatch.setattr(
+        cryptotick,
+        "ProcessPoolExecutor",
+        lambda **kwargs: InlineExecutor(running=running, **kwargs),
+    )
+    monkeypatch.setattr(cryptotick, "run_partition", run_partition)
+    bitmex.main_parallel()
+
+
+def test_main_parallel_maybe_complete(monkeypatch, capsys):
+    partitions = []
+
+    def run_partition(crypto_tick, partition):
+        partitions.append(partition.day)
+        # No data before the 8th
+        return partition.day > 8
+
+    main_parallel(monkeypatch, run_partition, {"2021-01-09": {"ok": True}})
+    # Pending partitions were cancelled
+    assert partitions == [10, 8]
+    assert "Maybe complete" in capsys.readouterr().out
+
+
+def test_main_parallel_failures(monkeypatch):
+    partitions = []
+
+    def run_partition(crypto_tick, partition):
+        partitions.append(partition.day)
+        if partition.day in (3, 7):
+            raise Exception("Failed")
+        return True
+
+    with pytest.raises(Exception, match="failed 2021-01-07, 2021-01-03"):
+        main_parallel(monkeypatch, run_partition)
+    # Failures do not stop other partitions
+    assert partitions == list(range(10, 0, -1))
+
+
+def test_main_parallel_maybe_complete_running(monkeypatch):
+    partitions = []
+
+    def run_partition(crypto_tick, partition):
+        partitions.append(partition.day)
+        if partition.day == 7:
+            raise Exception("Failed")
+        return partition.day > 8
+
+    with pytest.raises(Exception, match="failed 2021-01-07"):
+        main_parallel(monkeypatch, run_partition, running=(7,))
+    # Running partitions are not cancelled, and their failures are reported.
+    assert partitions == [10, 9, 8, 7]
+
+
+def test_main_parallel_batch(monkeypatch):
+    with pytest.raises(AssertionError):
+        get_bitmex(monkeypatch, {}, workers=2, batch=True)
+
+
+def main_prefetch(monkeypatch, download, write):
+    bitmex = get_bitmex(
+        monkeypatch, {}, period_to=pendulum.date(2021, 1, 10), prefetch=2
+    )
+
+    class HistoricalDownloader:
+        def __init__(self, url, **kwargs):
+            self.partition = url
+
+        def download(self):
+            return download(self.partition)
+
+        def extract(self, content):
+            return pd.DataFrame({"day": [content]})
+
+    monkeypatch.setattr(cryptotick, "HistoricalDownloader", HistoricalDownloader)
+    bitmex.get_url = lambda partition: partition
+    bitmex.filter_dataframe = lambda data_frame: data_frame
+    bitmex.parse_dataframe = lambda data_frame: data_frame
+    bitmex.write = write
+    bitmex.main_prefetch()
+
+
+def test_main_prefetch(monkeypatch):
+    days = []
+    main_prefetch(
+        monkeypatch,
+        lambda partition: partition.day,
+        lambda data_frame: days.append(data_frame.day[0]),
+    )
+    # Written in order
+    assert days == list(range(10, 0, -1))
+
+
+def test_main_prefetch_maybe_complete(monkeypatch):
+    days = []
+    main_prefetch(
+        monkeypatch,
+        # No data before the 6th
+        lambda partition: partition.day if partition.day >= 6 else None,
+        lambda data_frame: days.append(data_frame.day[0]),
+    )
+    assert days == [10, 9, 8, 7, 6]
+
+
+def test_main_prefetch_download_error(monkeypatch):
+    days = []
+
+    def download(partition):
+        if partition.day == 6:
+            raise Exception("Download failed")
+        return partition.day
+
+    with pytest.raises(Exception, match="Download failed"):
+        main_prefetch(
+            monkeypatch, download, lambda data_frame: days.append(data_frame.day[0])
+        )
+    # Partitions that were downloaded, are written.
+    assert days == [10, 9, 8, 7]
+
+
+def test_main_prefetch_write_error(monkeypatch):
+    days = []
+
+    def write(data_frame):
+        day = data_frame.day[0]
+        if day == 8:
+            raise Exception("Write failed")
+        days.append(day)
+
+    with pytest.raises(Exception, match="Write failed"):
+        main_prefetch(monkeypatch, lambda partition: partition.day, write)
+    assert days == [10, 9]
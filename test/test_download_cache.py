@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from cryptotick.s3downloader import DownloadCache
+
+URL = "https://example.com/20210101.csv.gz"
+
+
+@pytest.fixture
+def head(monkeypatch):
+    response = Mock(status_code=200, headers={"ETag": "a"})
+    monkeypatch.setattr(httpx.Client, "head", Mock(return_value=response))
+    return response
+
+
+def test_download_cache(tmp_path, head):
+    cache = DownloadCache(tmp_path)
+    assert cache.get(URL) is None
+    cache.set(URL, b"data", {"ETag": "a"})
+    assert cache.get(URL) == b"data"
+
+
+def test_download_cache_etag_changed(tmp_path, head):
+    cache = DownloadCache(tmp_path)
+    cache.set(URL, b"data", {"ETag": "b"})
+    assert cache.get(URL) is None
+    assert not cache.get_path(URL).exists()
+
+
+def test_download_cache_content_length(tmp_path, head):
+    head.headers = {"Content-Length": "4"}
+    cache = DownloadCache(tmp_path)
+    cache.set(URL, b"data")
+    assert cache.get(URL) == b"data"
+    head.headers = {"Content-Length": "5"}
+    assert cache.get(URL) is None
+
+
+def test_download_cache_lru_eviction(tmp_path, head):
+    cache = DownloadCache(tmp_path, max_size=10)
+    urls = [f"{URL}?{index}" for index in range(3)]
+    cache.set(urls[0], b"12345", {"ETag": "a"})
+    cache.set(urls[1], b"12345", {"ETag": "a"})
+    # Most recently used
+    cache.get(urls[0])
+    cache.set(urls[2], b"12345", {"ETag": "a"})
+    assert cache.get(urls[0]) == b"12345"
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[2]) == b"12345"
+
+
+def test_download_cache_evicted_by_other_process(tmp_path, head):
+    cache = DownloadCache(tmp_path)
+    cache.set(URL, b"data", {"ETag": "a"})
+    # Content deleted, after metadata was read
+    cache.get_path(URL).unlink()
+    assert cache.get(URL) is None
+    # Metadata deleted
+    cache.delete(URL)
+    assert cache.get(URL) is None
+
+
+def test_download_cache_evict_missing_file(tmp_path, head, monkeypatch):
+    cache = DownloadCache(tmp_path, max_size=4)
+    cache.set(URL, b"data", {"ETag": "a"})
+    path = cache.get_path(URL)
+    glob = cache.directory.glob
+    # Deleted by another process, after glob
+    monkeypatch.setattr(
+        type(cache.directory),
+        "glob",
+        lambda self, pattern: list(glob(pattern)) + [tmp_path / "other.gz"],
+    )
+    cache.set(f"{URL}?1", b"12345", {"ETag": "a"})
+    assert not path.exists()
@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock
+
+import pytest
+from cryptotick.fscache import (
+    FirestoreWriter,
+    clear_firestore_caches,
+    fscache,
+    get_firestore_cache,
+    writer,
+)
+from google.api_core.exceptions import ServiceUnavailable
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = MagicMock()
+    document = client.collection.return_value.document.return_value
+    document.get.return_value.to_dict.return_value = {"ok": True}
+    monkeypatch.setenv("FIREBASE_INIT", "true")
+    monkeypatch.setattr(fscache.firestore, "client", MagicMock(return_value=client))
+    return client
+
+
+def test_firestore_cache(client):
+    firestore_cache = get_firestore_cache("test-firestore-cache")
+    assert get_firestore_cache("test-firestore-cache") is firestore_cache
+    document = client.collection.return_value.document.return_value
+    # Read through
+    assert firestore_cache.has_data("2021-01-01")
+    assert firestore_cache.get("2021-01-01") == {"ok": True}
+    assert document.get.call_count == 1
+    # Write through
+    firestore_cache.set("2021-01-02", {"ok": False})
+    assert not firestore_cache.has_data("2021-01-02")
+    assert document.get.call_count == 1
+
+
+def test_firestore_cache_get_all(client):
+    snapshot = MagicMock(id="2021-01-01")
+    snapshot.to_dict.return_value = {"ok": True}
+    client.get_all.return_value = [snapshot]
+    firestore_cache = get_firestore_cache("test-firestore-cache-get-all")
+    documents = ["2021-01-01", "2021-01-02"]
+    assert firestore_cache.get_all(documents) == {
+        "2021-01-01": {"ok": True},
+        "2021-01-02": None,
+    }
+    # Cached
+    assert firestore_cache.has_data("2021-01-01")
+    assert not firestore_cache.has_data("2021-01-02")
+    firestore_cache.get_all(documents)
+    assert client.get_all.call_count == 1
+    document = client.collection.return_value.document.return_value
+    assert document.get.call_count == 0
+
+
+def test_firestore_writer(monkeypatch):
+    monkeypatch.setattr(writer.time, "sleep", MagicMock())
+    client = MagicMock()
+    batch = client.batch.return_value
+    # Retry with backoff
+    batch.commit.side_effect = [ServiceUnavailable("unavailable"), None]
+    firestore_writer = FirestoreWriter(client)
+    firestore_writer.set("2021-01-01", {"ok": True})
+    firestore_writer.flush()
+    assert batch.commit.call_count == 2
+    batch.set.assert_called_with("2021-01-01", {"ok": True})
+    writer.time.sleep.assert_called_once_with(1)
+
+
+def test_firestore_writer_on_commit():
+    client = MagicMock()
+    committed = []
+    firestore_writer = FirestoreWriter(client)
+    firestore_writer.set(
+        "2021-01-01", {"ok": True}, on_commit=lambda: committed.append(True)
+    )
+    firestore_writer.flush()
+    client.batch.return_value.commit.assert_called_once()
+    assert committed == [True]
+
+
+def test_firestore_writer_error():
+    client = MagicMock()
+    client.batch.return_value.commit.side_effect = ValueError
+    firestore_writer = FirestoreWriter(client)
+    firestore_writer.set("2021-01-01", {"ok": True})
+    with pytest.raises(ValueError):
+        firestore_writer.flush()
+    # Errors are raised once
+    firestore_writer.flush()
+
+
+def test_firestore_cache_is_cleared_per_run(client):
+    firestore_cache = get_firestore_cache("test-firestore-cache-cleared")
+    document = client.collection.return_value.document.return_value
+    document.get.return_value.to_dict.return_value = None
+    assert firestore_cache.get("2021-01-01") is None
+    # Written by another run
+    document.get.return_value.to_dict.return_value = {"ok": True}
+    assert firestore_cache.get("2021-01-01") is None
+    clear_firestore_caches()
+    assert firestore_cache.has_data("2021-01-01")
+    assert document.get.call_count == 2
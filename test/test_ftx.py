@@ -0,0 +1,97 @@
+import datetime
+import re
+
+from cryptotick.providers.ftx import base
+from cryptotick.providers.ftx.constants import MAX_RESULTS
+from cryptotick.providers.ftx.perpetual import FTXDailyPartition
+
+from .utils import FakeClient, FakeRateLimiter
+
+TIMESTAMP = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+ONE_MINUTE = 60 * 1_000_000
+ONE_HOUR = 60 * ONE_MINUTE
+
+
+def get_trades():
+    """Trade ids, and microseconds since TIMESTAMP."""
+    # One trade every 5 minutes, from one hour before until one hour after
+    trades = [
+        (index + 100, minutes * ONE_MINUTE)
+        for index, minutes in enumerate(range(-60, 25 * 60, 5))
+    ]
+    # Exactly MAX_RESULTS trades with the same timestamp
+    trades += [(10_000 + index, 6 * ONE_HOUR + 30_000_000) for index in range(200)]
+    # Trade ids are not in time order, at the window boundary
+    trades += [(1, 12 * ONE_HOUR), (20_000, 12 * ONE_HOUR - 1)]
+    return trades
+
+
+TRADES = get_trades()
+
+
+def get_microseconds(url, key):
+    value = re.search(rf"{key}=([\d.]+)", url).group(1)
+    return round(float(value) * 1_000_000) - round(TIMESTAMP.timestamp() * 1_000_000)
+
+
+def handler(url):
+    # Start time and end time are inclusive, newest trades first.
+    start = get_microseconds(url, "start_time")
+    end = get_microseconds(url, "end_time")
+    trades = sorted(
+        [trade for trade in TRADES if start <= trade[1] <= end],
+        key=lambda trade: (trade[1], trade[0]),
+        reverse=True,
+    )
+    result = [
+        {
+            "id": trade_id,
+            "time": (
+                TIMESTAMP + datetime.timedelta(microseconds=microseconds)
+            ).isoformat(),
+            "price": 1,
+            "size": 1,
+            "side": "buy",
+        }
+        for trade_id, microseconds in trades[:MAX_RESULTS]
+    ]
+    return {"success": True, "result": result}, {}
+
+
+def get_ftx(monkeypatch, client, shards):
+    monkeypatch.setattr(base, "get_async_client", lambda url: client)
+    monkeypatch.setattr(FTXDailyPartition, "rate_limiter", FakeRateLimiter())
+    return FTXDailyPartition("BTC-PERP", shards=shards)
+
+
+def test_sharded_trades(monkeypatch):
+    client = FakeClient(handler)
+    ftx = get_ftx(monkeypatch, client, shards=2)
+    timestamp_from, timestamp_to = ftx.get_timestamp_from_to(TIMESTAMP.date())
+    trades = ftx.get_sharded_trades(timestamp_from, timestamp_to)
+    expected = sorted(
+        [trade for trade in TRADES if 0 <= trade[1] < 24 * ONE_HOUR],
+        key=lambda trade: (trade[1], trade[0]),
+        reverse=True,
+    )
+    # Trades on window boundaries, are neither missing nor duplicated
+    assert [trade["index"] for trade in trades] == [trade[0] for trade in expected]
+    # MAX_RESULTS trades with same timestamp, so end time was decremented
+    assert any("end_time=1609480829.999999" in url for url in client.urls)
+
+
+def test_sharded_trades_window_boundary(monkeypatch):
+    client = FakeClient(handler)
+    ftx = get_ftx(monkeypatch, client, shards=2)
+    timestamp_from, timestamp_to = ftx.get_timestamp_from_to(TIMESTAMP.date())
+    trades = ftx.get_sharded_trades(timestamp_from, timestamp_to)
+    boundary = TIMESTAMP + datetime.timedelta(hours=12)
+    index = trades.bisect(boundary)
+    # Trades at the boundary, belong to the later window
+    expected = [trade[0] for trade in TRADES if trade[1] == 12 * ONE_HOUR]
+    assert [trade["index"] for trade in trades[index - 2 : index]] == sorted(
+        expected, reverse=True
+    )
+    # Trade at the end of the partition, belongs to the next partition
+    assert trades[0]["timestamp"] < timestamp_to
+    assert trades[-1]["timestamp"] == timestamp_from
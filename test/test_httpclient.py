@@ -0,0 +1,90 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from cryptotick.httpclient import (
+    get_async_client,
+    get_client,
+    get_client_stats,
+    run_async,
+)
+from cryptotick.httpclient.lib import update_stats
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client(url):
+    client = get_client(url)
+    assert get_client(url) is client
+    for _ in range(3):
+        assert client.get(url).status_code == 200
+    stats = get_client_stats()["127.0.0.1"]
+    assert stats["connections"] == 1
+    assert stats["reused"] == stats["requests"] - 1
+
+
+def test_async_client(url):
+    async def main():
+        client = get_async_client(url)
+        assert get_async_client(url) is client
+        for _ in range(3):
+            response = await client.get(url)
+            assert response.status_code == 200
+        return client
+
+    client = run_async(main())
+    assert client.is_closed
+
+
+def test_async_client_stats(url):
+    async def main():
+        client = get_async_client(url)
+        for _ in range(3):
+            await client.get(url)
+
+    requests = get_client_stats()["127.0.0.1"]["requests"]
+    run_async(main())
+    stats = get_client_stats()["127.0.0.1"]
+    # New event loop, so new client and connection
+    assert stats["requests"] == requests + 3
+    assert stats["reused"] >= 2
+
+
+class Connection:
+    pass
+
+
+def test_client_stats_pool_connections():
+    # Before httpcore 0.14, connections are by origin.
+    connections = [Connection(), Connection()]
+    pool = SimpleNamespace(_connections={"origin": set(connections[:1])})
+    client = SimpleNamespace(_transport=pool)
+    request = SimpleNamespace(url=SimpleNamespace(host="pool-connections"))
+    for _ in range(2):
+        update_stats(client, SimpleNamespace(request=request))
+    pool._connections["origin"].add(connections[1])
+    update_stats(client, SimpleNamespace(request=request))
+    stats = get_client_stats()["pool-connections"]
+    assert stats == {"requests": 3, "connections": 2, "reused": 1}
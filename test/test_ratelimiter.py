@@ -0,0 +1,35 @@
+from unittest.mock import Mock
+
+from cryptotick.ratelimiter import RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limiter():
+    clock = Clock()
+    rate_limiter = RateLimiter(2, clock=clock)
+    assert rate_limiter.reserve() == 0
+    # Smooth, not burst
+    assert rate_limiter.reserve() == 0.5
+    assert rate_limiter.reserve() == 1
+    clock.now = 10
+    assert rate_limiter.reserve() == 0
+
+
+def test_rate_limiter_retry_after():
+    clock = Clock()
+    rate_limiter = RateLimiter(2, clock=clock)
+    response = Mock(status_code=429, headers={"Retry-After": "5"})
+    assert rate_limiter.is_rate_limited(response)
+    assert rate_limiter.reserve() == 5
+    # Adaptive
+    assert rate_limiter.rate == 1
+    response = Mock(status_code=200, headers={})
+    assert not rate_limiter.is_rate_limited(response)
+    assert rate_limiter.rate == 1.1
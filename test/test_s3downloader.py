@@ -0,0 +1,98 @@
+import datetime
+import gzip
+
+import pandas as pd
+from cryptotick.providers.bitmex.lib import calc_notional
+from cryptotick.s3downloader import (
+    HistoricalDownloader,
+    calculate_notional,
+    calculate_tick_rule,
+    strip_nanoseconds,
+    utc_timestamp,
+)
+
+
+def get_data_frame():
+    return pd.DataFrame(
+        {
+            "symbol": ["XBTUSD", "ETHUSD", "XBTUSD"],
+            "timestamp": pd.to_datetime(
+                [
+                    "2021-01-01 00:00:00.000001",
+                    "2021-01-01 00:00:00.000001001",
+                    "2021-01-01 00:00:01.999999999",
+                ]
+            ),
+            "volume": [100, 2, 300],
+            "price": [20000.0, 500.0, 30000.0],
+            "tickDirection": ["PlusTick", "ZeroMinusTick", "ZeroPlusTick"],
+        }
+    )
+
+
+def get_csv(rows=1000):
+    lines = ["timestamp,symbol,side,size,price,tickDirection,trdMatchID,grossValue"]
+    for index in range(rows):
+        timestamp = f"2016-05-14D00:00:{index % 60:02d}.637445000"
+        uid = f"{index:08d}-0000-0000-0000-000000000000"
+        lines.append(f"{timestamp},XBTUSD,Buy,{index},455.5,PlusTick,{uid},1000")
+    return "\n".join(lines).encode() + b"\n"
+
+
+def test_utc_timestamp():
+    data_frame = utc_timestamp(get_data_frame())
+    assert data_frame.timestamp.dt.tz == datetime.timezone.utc
+
+
+def test_strip_nanoseconds():
+    data_frame = strip_nanoseconds(utc_timestamp(get_data_frame()))
+    assert list(data_frame.nanoseconds) == [0, 1, 999]
+    assert list(data_frame.timestamp.dt.nanosecond) == [0, 0, 0]
+    assert list(data_frame.timestamp.dt.microsecond) == [1, 1, 999999]
+
+
+def test_calculate_tick_rule():
+    data_frame = calculate_tick_rule(get_data_frame())
+    assert list(data_frame.tickRule) == [1, -1, 1]
+
+
+def test_calculate_notional():
+    data_frame = calculate_notional(get_data_frame(), calc_notional)
+    assert list(data_frame.notional) == [100 / 20000, 2 * 500 * 0.000001, 300 / 30000]
+
+
+def test_historical_downloader_extract():
+    content = gzip.compress(get_csv())
+    data_frame = HistoricalDownloader("test")._extract(content)
+    assert len(data_frame) == 1000
+    assert data_frame.columns.tolist() == list(HistoricalDownloader("test").columns)
+    assert data_frame.timestamp.iloc[0] == "2016-05-14D00:00:00.637445000"
+
+
+def test_historical_downloader_extract_truncated():
+    content = gzip.compress(get_csv(rows=100000))
+    data_frame = HistoricalDownloader("test")._extract(content[:-1000])
+    assert 0 < len(data_frame) < 100000
+    assert not data_frame.isnull().values.any()
+
+
+def test_historical_downloader_extract_batches():
+    lines = get_csv(rows=10000).decode().split("\n")
+    # Alternate symbols
+    lines = [
+        line.replace("XBTUSD", "ETHUSD") if index % 2 else line
+        for index, line in enumerate(lines)
+    ]
+    content = gzip.compress("\n".join(lines).encode())
+    historical_downloader = HistoricalDownloader(
+        "test", symbols=["XBTUSD"], block_size=16 * 1024
+    )
+    data_frame = historical_downloader._extract_batches(content)
+    assert len(data_frame) == 5000
+    assert data_frame.symbol.unique().tolist() == ["XBTUSD"]
+    # Row numbers of the file
+    assert data_frame.index.tolist() == list(range(1, 10000, 2))
+    # Truncated
+    data_frame = historical_downloader._extract_batches(content[:-1000])
+    assert 0 < len(data_frame) < 5000
+    assert data_frame.symbol.unique().tolist() == ["XBTUSD"]
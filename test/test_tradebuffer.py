@@ -0,0 +1,110 @@
+import datetime
+
+import pandas as pd
+import pendulum
+from pandas.testing import assert_frame_equal
+
+from cryptotick.bqloader import SINGLE_SYMBOL_SCHEMA, get_schema_columns
+from cryptotick.providers.coinbase.base import BaseCoinbase
+from cryptotick.providers.coinbase.spot import CoinbaseHourlyPartition
+from cryptotick.tradebuffer import TradeBuffer, parse_timestamps
+
+COLUMNS = get_schema_columns(SINGLE_SYMBOL_SCHEMA)
+
+
+def get_trades(timestamp, minutes):
+    # Reverse order
+    trades = []
+    for index in range(minutes, 0, -1):
+        trades.append(
+            {
+                "uid": str(index),
+                "timestamp": timestamp + datetime.timedelta(minutes=index),
+                "nanoseconds": 0,
+                "price": float(index),
+                "volume": float(index),
+                "notional": 1.0,
+                "tickRule": 1,
+                "index": index,
+            }
+        )
+    return trades
+
+
+def get_trade_buffer(trades):
+    data = {column: [trade[column] for trade in trades] for column in COLUMNS}
+    data["timestamp"] = parse_timestamps([t.isoformat() for t in data["timestamp"]])
+    trade_buffer = TradeBuffer(COLUMNS)
+    trade_buffer.extend_columns(data)
+    return trade_buffer
+
+
+def test_trade_buffer():
+    timestamp = datetime.datetime(2021, 1, 1, 23, 0, 0, 1, datetime.timezone.utc)
+    trades = get_trades(timestamp, 120)
+    trade_buffer = get_trade_buffer(trades[:50])
+    trade_buffer.extend(get_trade_buffer(trades[50:]))
+    assert len(trade_buffer) == 120
+    assert trade_buffer[0] == trades[0]
+    assert trade_buffer[-1] == trades[-1]
+    # Bisect
+    date = datetime.datetime(2021, 1, 2, tzinfo=datetime.timezone.utc)
+    index = trade_buffer.bisect(date)
+    assert trade_buffer[index - 1]["timestamp"] >= date
+    assert trade_buffer[index]["timestamp"] < date
+    assert len(trade_buffer[:index]) == 61
+
+
+def test_trade_buffer_hourly():
+    timestamp = datetime.datetime(2021, 1, 1, 22, 0, 0, 1, datetime.timezone.utc)
+    trades = get_trades(timestamp, 120)
+    coinbase = CoinbaseHourlyPartition("BTC-USD")
+    # Hourly partitions are pendulum
+    coinbase.set_partition(pendulum.datetime(2021, 1, 1, 23))
+    assert not len(coinbase.get_valid_trades(coinbase.trades))
+    data = coinbase.get_valid_trades(get_trade_buffer(trades))
+    assert len(data) == 60
+    assert data[0]["timestamp"] == timestamp + datetime.timedelta(minutes=119)
+    assert data[-1]["timestamp"] == timestamp + datetime.timedelta(minutes=60)
+
+
+def test_trade_buffer_data_frame():
+    timestamp = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+    trades = get_trades(timestamp, 10)
+    trade_buffer = get_trade_buffer(trades)
+    expected = pd.DataFrame(trades, columns=COLUMNS)
+    expected["timestamp"] = expected["timestamp"].astype("datetime64[ns, UTC]")
+    assert_frame_equal(trade_buffer.to_data_frame(), expected)
+
+
+def test_parse_data():
+    data = [
+        {
+            "time": "2021-01-01T00:00:01.5Z",
+            "trade_id": 2,
+            "price": "29000.01",
+            "size": "0.5",
+            "side": "sell",
+        },
+        {
+            "time": "2021-01-01T00:00:00Z",
+            "trade_id": 1,
+            "price": "29000",
+            "size": "0.1",
+            "side": "buy",
+        },
+    ]
+    trades = BaseCoinbase("BTC-USD").parse_data(data)
+    assert trades[0] == {
+        "uid": "2",
+        "timestamp": datetime.datetime(
+            2021, 1, 1, 0, 0, 1, 500000, datetime.timezone.utc
+        ),
+        "nanoseconds": 0,
+        "price": 29000.01,
+        "volume": 29000.01 * 0.5,
+        "notional": 0.5,
+        "tickRule": 1,
+        "index": 2,
+    }
+    assert trades[1]["tickRule"] == -1
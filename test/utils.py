@@ -1,7 +1,9 @@
 import datetime
 import random
+from types import SimpleNamespace
 
 import pandas as pd
+from yapic import json
 
 
 def get_trade(
@@ -66,3 +68,26 @@ def get_data_frame(all_trades):
         trades += get_trades(ticks, **trade)
     data_frame = pd.DataFrame(trades)
     return data_frame, has_multiple_symbols
+
+
+class FakeClient:
+    """Async client, with responses of handler."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.urls = []
+
+    async def get(self, url):
+        self.urls.append(url)
+        data, headers = self.handler(url)
+        return SimpleNamespace(
+            status_code=200, content=json.dumps(data).encode(), headers=headers
+        )
+
+
+class FakeRateLimiter:
+    async def acquire_async(self):
+        pass
+
+    def is_rate_limited(self, response):
+        return False